@@ -1,4 +1,5 @@
 import os
+import hmac
 import json
 import re
 import time
@@ -9,8 +10,8 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
 from selenium.webdriver.common.action_chains import ActionChains
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, Tuple, List
+from pydantic import BaseModel, ConfigDict, ValidationError
+from typing import Optional, Dict, Any, Tuple, List, Literal
 from fastapi import FastAPI, HTTPException, Header, Request
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
@@ -22,7 +23,6 @@ import base64
 import fitz  # PyMuPDF
 from dotenv import load_dotenv  # Import python-dotenv
 from azure.storage.blob import BlobServiceClient
-import requests
 import traceback
 
 # Load environment variables from .env file
@@ -45,6 +45,9 @@ CONFIG = {
     'SALESFORCE_PASSWORD': os.getenv("SALESFORCE_PASSWORD"),
     'SALESFORCE_TOKEN': os.getenv("SALESFORCE_TOKEN"),
     'SALESFORCE_CALLBACK_URL': os.getenv("SALESFORCE_CALLBACK_URL"),
+    # Optional: when set (e.g. https://<my-domain>.my.salesforce.com/services/oauth2/token), EIN updates use a
+    # password-grant token for SALESFORCE_USERNAME instead of the static SALESFORCE_TOKEN's user
+    'SALESFORCE_TOKEN_URL': os.getenv("SALESFORCE_TOKEN_URL"),
     'AZURE_STORAGE_ACCOUNT_NAME': os.getenv("AZURE_STORAGE_ACCOUNT_NAME", "formfillscreenshots"),
     'AZURE_ACCESS_KEY': os.getenv("AZURE_ACCESS_KEY"),
     'AZURE_CONTAINER_NAME': os.getenv("AZURE_CONTAINER_NAME", "payload"),
@@ -65,6 +68,48 @@ os.makedirs(CONFIG['STATIC_DIR'], exist_ok=True)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared HTTP client so Salesforce calls reuse pooled TCP/TLS connections
+HTTP = httpx.AsyncClient(timeout=30.0, limits=httpx.Limits(max_connections=50, max_keepalive_connections=20))
+_sf_token_cache = {"token": None, "expiry": 0.0, "oauth_retry_at": 0.0}
+# After a failed password grant, use the static SALESFORCE_TOKEN for this long before trying OAuth again
+SF_OAUTH_BACKOFF = 300
+
+async def get_sf_token(refresh: bool = False) -> str:
+    """Return the cached Salesforce access token, re-authenticating only once it is about to expire.
+
+    Without SALESFORCE_TOKEN_URL this is the static SALESFORCE_TOKEN. It is also the fallback while
+    OAuth is failing; ``refresh`` forces a new grant.
+    """
+    if not CONFIG['SALESFORCE_TOKEN_URL']:
+        return CONFIG['SALESFORCE_TOKEN']
+    now = time.time()
+    if not refresh:
+        if _sf_token_cache["token"] and now < _sf_token_cache["expiry"] - 30:
+            return _sf_token_cache["token"]
+        if now < _sf_token_cache["oauth_retry_at"]:
+            return CONFIG['SALESFORCE_TOKEN']
+    try:
+        response = await HTTP.post(CONFIG['SALESFORCE_TOKEN_URL'], data={
+            "grant_type": "password",
+            "client_id": CONFIG['SALESFORCE_CLIENT_ID'],
+            "client_secret": CONFIG['SALESFORCE_CLIENT_SECRET'],
+            "username": CONFIG['SALESFORCE_USERNAME'],
+            "password": CONFIG['SALESFORCE_PASSWORD'],
+        })
+        response.raise_for_status()
+        payload = response.json()
+    except Exception as e:
+        logger.warning(f"Salesforce OAuth failed, using SALESFORCE_TOKEN for the next {SF_OAUTH_BACKOFF}s: {e}")
+        _sf_token_cache["token"] = None
+        _sf_token_cache["oauth_retry_at"] = now + SF_OAUTH_BACKOFF
+        return CONFIG['SALESFORCE_TOKEN']
+    _sf_token_cache["token"] = payload["access_token"]
+    # The password flow may omit expires_in; assume Salesforce's default session lifetime of 2 hours
+    _sf_token_cache["expiry"] = now + int(payload.get("expires_in", 7200))
+    _sf_token_cache["oauth_retry_at"] = 0.0
+    logger.info("Acquired Salesforce access token")
+    return _sf_token_cache["token"]
+
 # Data Models
 class ThirdPartyDesignee(BaseModel):
     name: Optional[str] = None
@@ -108,6 +153,13 @@ class CaseData(BaseModel):
     third_party_designee: Optional[ThirdPartyDesignee] = None
     llc_details: Optional[LLcDetails] = None
 
+class EinRequest(BaseModel):
+    """Incoming /run-irs-ein payload; only the routing fields are declared, the rest pass through"""
+    model_config = ConfigDict(extra="allow")
+
+    entityProcessId: str
+    formType: Literal["EIN"]
+
 # Reusable Form Automation Framework
 class FormAutomationBase:
     """Reusable base class for web form automation"""
@@ -921,32 +973,34 @@ class IRSEINAutomation(FormAutomationBase):
     async def update_salesforce_ein(self, record_id: str, ein: str) -> bool:
         """Update the EIN in Salesforce for the given record"""
         try:
-            # Assuming Salesforce API endpoint and authentication details are configured
-            # This is a placeholder for the actual Salesforce API call
-            salesforce_endpoint = os.getenv("SALESFORCE_ENDPOINT", "https://your-salesforce-instance.salesforce.com/services/data/vXX.0/sobjects/Entity__c")
-            salesforce_token = os.getenv("SALESFORCE_TOKEN", "your-salesforce-token")
-            
-            headers = {
-                "Authorization": f"Bearer {salesforce_token}",
-                "Content-Type": "application/json"
-            }
-            payload = {
-                "EIN__c": ein
-            }
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.patch(
-                    f"{salesforce_endpoint}/{record_id}",
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                logger.info(f"Successfully updated EIN {ein} for record {record_id} in Salesforce")
-                return True
+            salesforce_token = await get_sf_token()
+            response = await self._patch_salesforce_ein(record_id, ein, salesforce_token)
+            if response.status_code == 401:
+                # Token revoked or expired early; refresh once and retry so this update is not lost
+                refreshed_token = await get_sf_token(refresh=True)
+                if refreshed_token != salesforce_token:
+                    response = await self._patch_salesforce_ein(record_id, ein, refreshed_token)
+            response.raise_for_status()
+            logger.info(f"Successfully updated EIN {ein} for record {record_id} in Salesforce")
+            return True
         except Exception as e:
             logger.error(f"Failed to update Salesforce with EIN for record {record_id}: {e}")
             return False
 
+    async def _patch_salesforce_ein(self, record_id: str, ein: str, salesforce_token: str) -> httpx.Response:
+        headers = {
+            "Authorization": f"Bearer {salesforce_token}",
+            "Content-Type": "application/json"
+        }
+        payload = {
+            "EIN__c": ein
+        }
+        return await HTTP.patch(
+            f"{CONFIG['SALESFORCE_ENDPOINT']}/{record_id}",
+            headers=headers,
+            json=payload
+        )
+
     async def run_automation(self, data: CaseData) -> Tuple[bool, str, Optional[str], Optional[str], Optional[str], Optional[str], Optional[str]]:
         try:
             missing_fields = []
@@ -994,7 +1048,7 @@ class IRSEINAutomation(FormAutomationBase):
 
             json_data["response_status"] = "success"
             png_filename = f"print_{data.record_id}_{int(time.time())}.png"
-            png_path = self.capture_page_as_png(png_filename)
+            png_path, png_url = self.capture_page_as_png(png_filename)
             azure_blob_url = None
             if png_path:
                 azure_blob_url = self.upload_screenshot_to_azure_sync(
@@ -1071,7 +1125,7 @@ class IRSEINAutomation(FormAutomationBase):
 
             # Update the return tuple to include the assigned EIN and PDF URL
             pdf_url = f"{CONFIG['HOST_URL']}/static/{pdf_filename}" if pdf_path and os.path.exists(pdf_path) else None
-            return True, "Form submitted successfully", png_path, azure_blob_url, assigned_ein, pdf_url, pdf_azure_url
+            return True, "Form submitted successfully", png_url, azure_blob_url, assigned_ein, pdf_url, pdf_azure_url
         except Exception as e:
             logger.error(f"Automation failed: {e}")
             json_data["response_status"] = "fail"
@@ -1202,33 +1256,40 @@ app.add_middleware(
 )
 app.mount("/static", StaticFiles(directory=CONFIG['STATIC_DIR']), name="static")
 
+@app.on_event("shutdown")
+async def close_http_client():
+    await HTTP.aclose()
+
+# Expected Authorization header, built once for a constant-time comparison per request
+EXPECTED_AUTH = f"Bearer {CONFIG['API_KEY']}".encode()
+
 @app.post("/run-irs-ein")
 async def run_irs_ein_endpoint(request: Request, authorization: str = Header(None)):
     """Main endpoint for running IRS EIN automation with direct submission"""
-    logger.info(f"Received request from: {request.client.host if request.client else 'Unknown'}")
-    if authorization != f"Bearer {CONFIG['API_KEY']}":
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Received request from: %s", request.client.host if request.client else "Unknown")
+    if authorization is None or not hmac.compare_digest(authorization.encode(), EXPECTED_AUTH):
         raise HTTPException(status_code=401, detail="Invalid API key")
     try:
-        data = await request.json()
+        try:
+            # Parses and validates in one pass inside pydantic-core
+            ein_request = EinRequest.model_validate_json(await request.body())
+        except ValidationError as e:
+            # Only loc/msg: the raw input would echo the payload (and SSN) back to the caller
+            problems = [f"{'.'.join(map(str, err['loc'])) or 'body'}: {err['msg']}" for err in e.errors()]
+            raise HTTPException(status_code=400, detail=f"Invalid payload: {problems}")
+        data = ein_request.model_dump()
         logger.info(f"Received payload: {json.dumps(data, indent=2)}")
-        if not isinstance(data, dict):
-            raise HTTPException(status_code=400, detail="Invalid payload format - expected JSON object")
-        required_fields = ["entityProcessId", "formType"]
-        missing_fields = [field for field in required_fields if field not in data]
-        if missing_fields:
-            raise HTTPException(status_code=400, detail=f"Missing required fields: {missing_fields}")
-        if data.get("formType") != "EIN":
-            raise HTTPException(status_code=400, detail="Invalid formType, must be 'EIN'")
         case_data = DataProcessor.map_form_automation_data(data)
         logger.info(f"Mapped case data for record_id: {case_data.record_id}")
         automation = IRSEINAutomation()
-        success, message, png_path, azure_blob_url, assigned_ein, pdf_url, pdf_azure_url = await automation.run_automation(case_data)
+        success, message, png_url, azure_blob_url, assigned_ein, pdf_url, pdf_azure_url = await automation.run_automation(case_data)
         if success:
             return {
                 "message": "Form submitted successfully",
                 "status": "Submitted",
                 "record_id": case_data.record_id,
-                "png_url": png_path,
+                "png_url": png_url,
                 "azure_blob_url": azure_blob_url,
                 "assigned_ein": assigned_ein,
                 "pdf_url": pdf_url,
@@ -1243,14 +1304,24 @@ async def run_irs_ein_endpoint(request: Request, authorization: str = Header(Non
         logger.error(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+_RECORD_ID_RE = re.compile(r'[A-Za-z0-9_-]{1,64}')
+
+def find_latest_screenshot(record_id: str) -> Optional[str]:
+    """Newest print_<record_id>_*.png in the static dir, or None"""
+    prefix = f"print_{record_id}_"
+    with os.scandir(CONFIG['STATIC_DIR']) as entries:
+        latest = max((entry.name for entry in entries if entry.name.startswith(prefix) and entry.name.endswith(".png")),
+                     default=None)
+    return os.path.join(CONFIG['STATIC_DIR'], latest) if latest else None
+
 @app.get("/download-screenshot/{record_id}")
 async def download_screenshot(record_id: str):
     """Download screenshot for a record"""
-    png_files = [f for f in os.listdir(CONFIG['STATIC_DIR']) 
-                if f.startswith(f"print_{record_id}_") and f.endswith(".png")]
-    if not png_files:
+    if not _RECORD_ID_RE.fullmatch(record_id):
+        raise HTTPException(status_code=404, detail="Screenshot not found")
+    latest_png = await asyncio.to_thread(find_latest_screenshot, record_id)
+    if not latest_png:
         raise HTTPException(status_code=404, detail="Screenshot not found")
-    latest_png = os.path.join(CONFIG['STATIC_DIR'], sorted(png_files)[-1])
     return FileResponse(latest_png, media_type="image/png")
 
 if __name__ == "__main__":
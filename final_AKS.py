@@ -1,29 +1,29 @@
 import os
-import json
+import hmac
+import orjson
 import re
+import calendar
+import functools
 import time
-from datetime import datetime
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import Select
-from selenium.webdriver.common.action_chains import ActionChains
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, Tuple, List
-from fastapi import FastAPI, HTTPException, Header, Request
-from fastapi.responses import FileResponse
+from selenium.common.exceptions import (TimeoutException, ElementClickInterceptedException, ElementNotInteractableException,
+                                        NoSuchElementException, StaleElementReferenceException)
+from pydantic import BaseModel, ConfigDict, ValidationError
+from typing import Optional, Dict, Any, Tuple, List, Callable, Literal
+from fastapi import FastAPI, HTTPException, Header, Request, BackgroundTasks, Depends
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 import httpx
 import logging
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import base64
 import fitz  # PyMuPDF
 from dotenv import load_dotenv  # Import python-dotenv
-from azure.storage.blob import BlobServiceClient
-import requests
-import traceback
 
 # Load environment variables from .env file
 load_dotenv()
@@ -48,6 +48,13 @@ CONFIG = {
     'AZURE_STORAGE_ACCOUNT_NAME': os.getenv("AZURE_STORAGE_ACCOUNT_NAME", "formfillscreenshots"),
     'AZURE_ACCESS_KEY': os.getenv("AZURE_ACCESS_KEY"),
     'AZURE_CONTAINER_NAME': os.getenv("AZURE_CONTAINER_NAME", "payload"),
+    'SCREENSHOT_ZOOM': float(os.getenv("SCREENSHOT_ZOOM", "2.0")),
+    'SCREENSHOT_METHOD': os.getenv("SCREENSHOT_METHOD", "pdf").lower(),
+    'DRIVER_POOL_SIZE': int(os.getenv("DRIVER_POOL_SIZE", 2)),  # per worker process
+    # Each worker launches its own DRIVER_POOL_SIZE browsers; raise only on hosts sized for that
+    'WORKERS': int(os.getenv("WORKERS", 1)),
+    'BLOCK_IMAGES': os.getenv("BLOCK_IMAGES", "true").lower() == "true",
+    'HEADLESS': os.getenv("HEADLESS", "true").lower() == "true",
 }
 
 # Validate required environment variables
@@ -64,6 +71,150 @@ os.makedirs(CONFIG['STATIC_DIR'], exist_ok=True)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Azure Blob Storage: one async client for the process, reused by every upload.
+# The SDK is imported on first upload so it stays off the worker startup path.
+AZURE_CONNECTION_STRING = f"DefaultEndpointsProtocol=https;AccountName={CONFIG['AZURE_STORAGE_ACCOUNT_NAME']};AccountKey={CONFIG['AZURE_ACCESS_KEY']};EndpointSuffix=core.windows.net"
+
+@functools.cache
+def blob_service():
+    from azure.storage.blob.aio import BlobServiceClient
+    return BlobServiceClient.from_connection_string(AZURE_CONNECTION_STRING)
+
+@functools.cache
+def blob_container():
+    return blob_service().get_container_client(CONFIG['AZURE_CONTAINER_NAME'])
+
+@functools.cache
+def content_settings(content_type: str):
+    from azure.storage.blob import ContentSettings
+    return ContentSettings(content_type=content_type)
+
+def blob_url_for(blob_name: str) -> str:
+    return f"https://{CONFIG['AZURE_STORAGE_ACCOUNT_NAME']}.blob.core.windows.net/{CONFIG['AZURE_CONTAINER_NAME']}/{blob_name}"
+
+# Latest saved screenshot per record_id, so downloads can skip scanning the static dir.
+# The index is per process, so it is only kept with a single worker: with several, another
+# worker may save a newer screenshot this one never hears about.
+LATEST_SCREENSHOTS: Dict[str, str] = {}
+LATEST_SCREENSHOTS_MAX = 1024
+SCREENSHOT_INDEX_ENABLED = CONFIG['WORKERS'] == 1
+
+def remember_screenshot(record_id: str, png_path: str):
+    if not SCREENSHOT_INDEX_ENABLED:
+        return
+    LATEST_SCREENSHOTS.pop(record_id, None)
+    LATEST_SCREENSHOTS[record_id] = png_path
+    if len(LATEST_SCREENSHOTS) > LATEST_SCREENSHOTS_MAX:
+        LATEST_SCREENSHOTS.pop(next(iter(LATEST_SCREENSHOTS)))
+
+def find_latest_screenshot(record_id: str) -> Optional[str]:
+    """Single pass over the static dir for the newest print_<record_id>_*.png"""
+    # Scanning with a bytes path skips decoding every filename; only the match is decoded
+    prefix = os.fsencode(f"print_{record_id}_")
+    with os.scandir(os.fsencode(CONFIG['STATIC_DIR'])) as entries:
+        latest = max((entry.name for entry in entries if entry.name.startswith(prefix) and entry.name.endswith(b".png")),
+                     default=None)
+    return os.path.join(CONFIG['STATIC_DIR'], os.fsdecode(latest)) if latest else None
+
+# Image requests blocked while the form is filled; lifted before the confirmation page loads
+_BLOCKED_IMAGE_URLS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico"]
+
+def set_image_blocking(driver, blocked: bool):
+    """Block or allow image loads in a live browser via CDP"""
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_IMAGE_URLS if blocked else []})
+
+# Precompiled patterns used on every run
+_NONDIGIT = re.compile(r'\D')
+_NAME_CLEAN = re.compile(r'[^\w\s\-&]')
+_BLOB_CLEAN = re.compile(r'[^\w\-]')
+# Record IDs that may appear in a screenshot filename; anything else cannot match one
+RECORD_ID_RE = re.compile(r'[A-Za-z0-9_-]{1,64}')
+# YYYY-MM-DD, YYYY/MM/DD or MM/DD/YYYY
+_DATE_RE = re.compile(r'(\d{4})([-/])(\d{1,2})\2(\d{1,2})|(\d{1,2})/(\d{1,2})/(\d{4})')
+
+# closing_month spellings accepted for the fiscal month dropdown
+_MONTH_MAPPING = {
+    "january": "JANUARY", "jan": "JANUARY", "1": "JANUARY",
+    "february": "FEBRUARY", "feb": "FEBRUARY", "2": "FEBRUARY",
+    "march": "MARCH", "mar": "MARCH", "3": "MARCH",
+    "april": "APRIL", "apr": "APRIL", "4": "APRIL",
+    "may": "MAY", "5": "MAY",
+    "june": "JUNE", "jun": "JUNE", "6": "JUNE",
+    "july": "JULY", "jul": "JULY", "7": "JULY",
+    "august": "AUGUST", "aug": "AUGUST", "8": "AUGUST",
+    "september": "SEPTEMBER", "sep": "SEPTEMBER", "9": "SEPTEMBER",
+    "october": "OCTOBER", "oct": "OCTOBER", "10": "OCTOBER",
+    "november": "NOVEMBER", "nov": "NOVEMBER", "11": "NOVEMBER",
+    "december": "DECEMBER", "dec": "DECEMBER", "12": "DECEMBER"
+}
+
+_MAILING_KEYS = ("mailingStreet", "mailingCity", "mailingState", "mailingZip")
+
+# Fallbacks for CaseData fields a request leaves empty
+_DEFAULTS = {
+    'ssn_decrypted': "123456789",
+    'entity_name': "Lane Four Capital Partners LLC",
+    'business_address_1': "3315 Cherry Ln",
+    'city': "Austin",
+    'zip_code': "78703",
+    'business_description': "Any and lawful business",
+    'formation_date': "2024-05-24",
+    'county': "Travis",
+    'trade_name': "",
+    'care_of_name': "",
+    'closing_month': "",
+    'filing_requirement': ""
+}
+
+# Entity suffixes stripped from the legal name, longest first so PLLC wins over LLC and LC
+_NAME_SUFFIXES = tuple(sorted((s.upper() for s in ('Corp', 'Inc', 'LLC', 'LC', 'PLLC', 'PA')), key=len, reverse=True))
+
+# Locators
+CONTINUE_BTN = (By.CSS_SELECTOR, "input[type=submit][value='Continue >>']")
+BEGIN_BTN = (By.CSS_SELECTOR, "input[type=submit][name=submit][value='Begin Application >>']")
+ACCEPT_AS_ENTERED_BTN = (By.CSS_SELECTOR, "input[type=submit][name=Submit][value='Accept As Entered']")
+LLC_MEMBERS = (By.CSS_SELECTOR, "input#numbermem, input[name=numbermem]")
+ENTITY_TYPE_PAGE = (By.ID, "individual-leftcontent")
+LLC_STATE = (By.ID, "state")
+RESPONSIBLE_FIRST_NAME = (By.ID, "responsiblePartyFirstName")
+APPLICANT_FIRST_NAME = (By.ID, "applicantFirstName")
+RESPONSIBLE_LAST_NAME = (By.ID, "responsiblePartyLastName")
+APPLICANT_LAST_NAME = (By.ID, "applicantLastName")
+RESPONSIBLE_SSN3 = (By.ID, "responsiblePartySSN3")
+APPLICANT_SSN3 = (By.ID, "applicantSSN3")
+RESPONSIBLE_SSN2 = (By.ID, "responsiblePartySSN2")
+APPLICANT_SSN2 = (By.ID, "applicantSSN2")
+RESPONSIBLE_SSN4 = (By.ID, "responsiblePartySSN4")
+APPLICANT_SSN4 = (By.ID, "applicantSSN4")
+# The IRS form uses applicant* IDs in place of responsibleParty* IDs for some entity types;
+# _bulk_fill fills whichever ID of each pair is on the page
+FIRST_NAME_IDS = f"{RESPONSIBLE_FIRST_NAME[1]},{APPLICANT_FIRST_NAME[1]}"
+LAST_NAME_IDS = f"{RESPONSIBLE_LAST_NAME[1]},{APPLICANT_LAST_NAME[1]}"
+SSN3_IDS = f"{RESPONSIBLE_SSN3[1]},{APPLICANT_SSN3[1]}"
+SSN2_IDS = f"{RESPONSIBLE_SSN2[1]},{APPLICANT_SSN2[1]}"
+SSN4_IDS = f"{RESPONSIBLE_SSN4[1]},{APPLICANT_SSN4[1]}"
+PHYS_STREET = (By.ID, "physicalAddressStreet")
+PHYS_CITY = (By.ID, "physicalAddressCity")
+PHYS_STATE = (By.ID, "physicalAddressState")
+PHYS_ZIP = (By.ID, "physicalAddressZipCode")
+PHONE_FIRST3 = (By.ID, "phoneFirst3")
+PHONE_MIDDLE3 = (By.ID, "phoneMiddle3")
+PHONE_LAST4 = (By.ID, "phoneLast4")
+PHYS_CARE_OF_NAME = (By.ID, "physicalAddressCareofName")
+MAIL_STREET = (By.ID, "mailingAddressStreet")
+MAIL_CITY = (By.ID, "mailingAddressCity")
+MAIL_STATE = (By.ID, "mailingAddressState")
+MAIL_ZIP = (By.ID, "mailingAddressPostalCode")
+BUSINESS_LEGAL_NAME = (By.CSS_SELECTOR, "input#businessOperationalLegalName")
+BUSINESS_COUNTY = (By.ID, "businessOperationalCounty")
+ARTICLES_FILED_STATE = (By.ID, "articalsFiledState")
+BUSINESS_STATE = (By.ID, "businessOperationalState")
+BUSINESS_TRADE_NAME = (By.ID, "businessOperationalTradeName")
+FORMATION_MONTH = (By.ID, "BUSINESS_OPERATIONAL_MONTH_ID")
+FORMATION_YEAR = (By.ID, "BUSINESS_OPERATIONAL_YEAR_ID")
+FISCAL_MONTH = (By.ID, "fiscalMonth")
+BUSINESS_DESCRIPTION = (By.ID, "pleasespecify")
+
 # Data Models
 class ThirdPartyDesignee(BaseModel):
     name: Optional[str] = None
@@ -107,6 +258,34 @@ class CaseData(BaseModel):
     third_party_designee: Optional[ThirdPartyDesignee] = None
     llc_details: Optional[LLcDetails] = None
 
+class EinRequest(BaseModel):
+    """Incoming /run-irs-ein payload; fields DataProcessor reads are declared, the rest pass through"""
+    model_config = ConfigDict(extra="allow")
+
+    entityProcessId: str
+    formType: Literal["EIN"]
+    legalName: Optional[str] = None
+    entityType: Optional[str] = None
+    startDate: Optional[str] = None
+    principalLineOfBusiness: Optional[str] = None
+    principalActivity: Optional[str] = None
+    firstWagesDate: Optional[str] = None
+    county: Optional[str] = None
+    tradeName: Optional[str] = None
+    careOfName: Optional[str] = None
+    closingMonth: Optional[str] = None
+    filingRequirement: Optional[str] = None
+    responsibleParty: Dict[str, Any] = {}
+    ownershipDetails: List[Dict[str, Any]] = []
+    mailingAddress: Dict[str, Any] = {}
+    physicalAddress: Dict[str, Any] = {}
+    employeeDetails: Dict[str, Any] = {}
+    thirdPartyDesignee: Dict[str, Any] = {}
+    llcDetails: Dict[str, Any] = {}
+
+# Optional CaseData fields reported when missing from a request
+_DATA_FIELDS = tuple(name for name in CaseData.model_fields if name != "record_id")
+
 # Reusable Form Automation Framework
 class FormAutomationBase:
     """Reusable base class for web form automation"""
@@ -116,47 +295,104 @@ class FormAutomationBase:
         self.headless = headless
         self.driver = None
         self.wait = None
+        self._fast_wait = None
     
-    def fill_field(self, locator: Tuple[str, str], value: str, label: str = "field"):
-        """Fill a form field with error handling"""
+    # Looks the field up and fills it in the same call; returns false while it is not on the page yet
+    FILL_FIELD_SCRIPT = (
+        "const e = arguments[0] === 'id' ? document.getElementById(arguments[1]) : document.querySelector(arguments[1]);"
+        "if (!e) { return false; } e.focus(); e.value=arguments[2];"
+        "e.dispatchEvent(new Event('input',{bubbles:true})); e.dispatchEvent(new Event('change',{bubbles:true}));"
+        "return true;"
+    )
+
+    SCROLL_INTO_VIEW_SCRIPT = "arguments[0].scrollIntoView({block: 'center'});"
+
+    def fill_field(self, locator: Tuple[str, str], value: str, label: str = "field", use_send_keys: bool = False,
+                   wait: Optional[WebDriverWait] = None):
+        """Fill a form field with error handling.
+
+        Finds the field, sets the value and fires input/change events in a single
+        script call (ID or CSS locators); pass ``use_send_keys=True`` for fields
+        that need real keystrokes.
+        Lookups use the short field wait unless ``wait`` is given.
+        """
         if not value or not value.strip():
-            logger.warning(f"Skipping {label} - empty value")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Skipping {label} - empty value")
             return False
         
+        wait = wait or self._fast_wait
         try:
-            field = self.wait.until(EC.element_to_be_clickable(locator))
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", field)
-            field.clear()
-            field.send_keys(str(value))
+            if use_send_keys:
+                field = wait.until(EC.element_to_be_clickable(locator))
+                self.type_into(field, str(value))
+            else:
+                wait.until(lambda driver: driver.execute_script(self.FILL_FIELD_SCRIPT, *locator, str(value)))
             logger.info(f"Filled {label}: {value}")
             return True
         except Exception as e:
             logger.warning(f"Failed to fill {label}: {e}")
             return False
+
+    BULK_FILL_SCRIPT = (
+        "const missing=[];"
+        "for (const [ids,v] of Object.entries(arguments[0])) {"
+        "const e=ids.split(',').map(id => document.getElementById(id)).find(el => el);"
+        "if (!e) { missing.push(ids); continue; }"
+        "e.value=v; e.dispatchEvent(new Event('input',{bubbles:true})); e.dispatchEvent(new Event('change',{bubbles:true}));"
+        "if (e.value !== v) { missing.push(ids); }"
+        "} return missing;"
+    )
+
+    def _bulk_fill(self, mapping: Dict[str, str], label: str = "fields") -> List[str]:
+        """Fill several fields by ID in one script call; returns the IDs that were empty, not on the page
+        or did not keep the value (e.g. truncated by maxlength).
+
+        A key may list alternative IDs separated by commas; the first one present is filled.
+        """
+        values = {field_id: str(value) for field_id, value in mapping.items() if value and str(value).strip()}
+        skipped = [field_id for field_id in mapping if field_id not in values]
+        if not values:
+            return skipped
+        try:
+            selector = ", ".join(f"#{field_id}" for ids in values for field_id in ids.split(","))
+            self._fast_wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+        except TimeoutException:
+            return skipped + list(values)
+        missing = self.driver.execute_script(self.BULK_FILL_SCRIPT, values)
+        filled = [field_id for field_id in values if field_id not in missing]
+        if filled:
+            logger.info(f"Filled {label}: {', '.join(filled)}")
+        return skipped + missing
+
+    def type_into(self, field, value: str):
+        """Clear a field and type into it, scrolling it into view only if the browser refuses the keys"""
+        try:
+            field.clear()
+            field.send_keys(value)
+        except ElementNotInteractableException:
+            self.driver.execute_script(self.SCROLL_INTO_VIEW_SCRIPT, field)
+            field.clear()
+            field.send_keys(value)
     
-    def click_button(self, locator: Tuple[str, str], desc: str = "button", retries: int = 3) -> bool:
-        """Click a button with enhanced retry logic and multiple strategies"""
+    def click_button(self, locator: Tuple[str, str], desc: str = "button", retries: int = 1,
+                     await_locator: Optional[Tuple[str, str]] = None) -> bool:
+        """Click a button, falling back to a JavaScript click if the native click is blocked.
+
+        After the click, waits for ``await_locator`` to appear if given, otherwise
+        for the clicked element to go stale (i.e. the page to navigate).
+        """
         for attempt in range(retries + 1):
             try:
-                element = self.wait.until(EC.presence_of_element_located(locator))
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-                time.sleep(0.5)
                 clickable_element = self.wait.until(EC.element_to_be_clickable(locator))
-                click_strategies = [
-                    lambda: clickable_element.click(),
-                    lambda: self.driver.execute_script("arguments[0].click();", clickable_element),
-                    lambda: ActionChains(self.driver).move_to_element(clickable_element).click().perform()
-                ]
-                for strategy in click_strategies:
-                    try:
-                        strategy()
-                        logger.info(f"Clicked {desc}")
-                        time.sleep(1)
-                        return True
-                    except Exception as click_error:
-                        if strategy == click_strategies[-1]:
-                            raise click_error
-                        continue
+                try:
+                    # WebDriver scrolls the target into view itself for a native click
+                    clickable_element.click()
+                except (ElementClickInterceptedException, ElementNotInteractableException):
+                    self.driver.execute_script(self.SCROLL_INTO_VIEW_SCRIPT + " arguments[0].click();", clickable_element)
+                logger.info(f"Clicked {desc}")
+                self._wait_after_click(clickable_element, await_locator, desc)
+                return True
             except Exception as e:
                 if attempt == retries:
                     logger.warning(f"Failed to click {desc} after {retries + 1} attempts: {e}")
@@ -164,223 +400,80 @@ class FormAutomationBase:
                 logger.warning(f"Click attempt {attempt + 1} failed for {desc}: {e}, retrying...")
                 time.sleep(1)
         return False
+
+    def advance_two_pages(self, locator: Tuple[str, str], first_marker: Optional[Tuple[str, str]] = None,
+                          second_marker: Optional[Tuple[str, str]] = None, desc: str = "button") -> bool:
+        """Click through two consecutive pages instead of sleeping between clicks.
+
+        Each click waits for its marker if given, otherwise for the clicked button to go
+        stale. Markers must exist only on the next page; one already on the current page
+        would let the second click hit the old button.
+        """
+        if not self.click_button(locator, f"{desc} (first click)", await_locator=first_marker):
+            return False
+        return self.click_button(locator, f"{desc} (second click)", await_locator=second_marker)
+
+    def _wait_after_click(self, element, await_locator: Optional[Tuple[str, str]], desc: str):
+        """Wait for the page to react to a click instead of sleeping a fixed interval"""
+        try:
+            if await_locator:
+                self.wait.until(EC.presence_of_element_located(await_locator))
+            else:
+                self.wait.until(EC.staleness_of(element))
+        except TimeoutException:
+            logger.info(f"No page transition detected after clicking {desc}, proceeding")
     
     def select_radio(self, radio_id: str, desc: str = "radio") -> bool:
-        """Select radio button with enhanced reliability"""
+        """Select radio button with a real click so the page's change handlers fire"""
         try:
             radio = self.wait.until(EC.element_to_be_clickable((By.ID, radio_id)))
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", radio)
-            if self.driver.execute_script(f"document.getElementById('{radio_id}').checked = true; return document.getElementById('{radio_id}').checked;"):
-                logger.info(f"Selected {desc} via JavaScript")
-                return True
-            radio.click()
-            logger.info(f"Selected {desc} via click")
+            self.driver.execute_script("arguments[0].click();", radio)
+            logger.info(f"Selected {desc}")
             return True
         except Exception as e:
             logger.warning(f"Failed to select {desc} (ID: {radio_id}): {e}")
             return False
     
+    BULK_CLICK_SCRIPT = (
+        "return arguments[0].map(id => { const e=document.getElementById(id);"
+        "if (e) { e.click(); } return !!(e && e.checked); });"
+    )
+
+    OPTION_TEXTS_SCRIPT = "return Array.from(arguments[0].options, o => o.text);"
+
+    def _bulk_click_radios(self, radio_ids: List[str], desc: str = "radios") -> List[str]:
+        """Click several radio buttons in one script call; returns the IDs that did not end up checked"""
+        try:
+            self.wait.until(EC.presence_of_element_located((By.ID, radio_ids[0])))
+        except TimeoutException:
+            return list(radio_ids)
+        checked = self.driver.execute_script(self.BULK_CLICK_SCRIPT, list(radio_ids))
+        unchecked = [radio_id for radio_id, is_checked in zip(radio_ids, checked) if not is_checked]
+        if not unchecked:
+            logger.info(f"Selected {desc}")
+        return unchecked
+
+    SELECT_OPTION_SCRIPT = (
+        "const s=arguments[0]; s.value=arguments[1];"
+        "if (s.value !== arguments[1]) { return false; }"
+        "s.dispatchEvent(new Event('change',{bubbles:true})); return true;"
+    )
+
     def select_dropdown(self, locator: Tuple[str, str], value: str, label: str = "dropdown") -> bool:
-        """Select dropdown option"""
+        """Select dropdown option by value in a single script call"""
         try:
-            element = self.wait.until(EC.element_to_be_clickable(locator))
-            select = Select(element)
-            select.select_by_value(value)
+            element = self.wait.until(EC.presence_of_element_located(locator))
+            if not self.driver.execute_script(self.SELECT_OPTION_SCRIPT, element, value):
+                logger.warning(f"Failed to select {label}: no option with value {value}")
+                return False
             logger.info(f"Selected {label}: {value}")
             return True
         except Exception as e:
             logger.warning(f"Failed to select {label}: {e}")
             return False
     
-    def capture_page_as_png(self, filename: str) -> Tuple[Optional[str], Optional[str]]:
-        """
-        Capture page as PNG using direct screenshot method or PDF conversion
-        """
-        try:
-            # Method 1: Direct screenshot (most reliable on Windows)
-            logger.info("Attempting direct screenshot capture")
-            
-            # Ensure filename has .png extension
-            if not filename.lower().endswith('.png'):
-                filename = f"{os.path.splitext(filename)[0]}.png"
-                
-            png_path = os.path.join(CONFIG['STATIC_DIR'], filename)
-            os.makedirs(CONFIG['STATIC_DIR'], exist_ok=True)
-            
-            # Take screenshot directly
-            screenshot = self.driver.get_screenshot_as_png()
-            
-            with open(png_path, 'wb') as f:
-                f.write(screenshot)
-            
-            png_url = f"{CONFIG['HOST_URL']}/static/{filename}"
-            logger.info(f"PNG saved via screenshot: {png_path}")
-            
-            return png_path, png_url
-            
-        except Exception as screenshot_error:
-            logger.warning(f"Direct screenshot failed: {screenshot_error}")
-            
-            # Method 2: PDF conversion with Windows-compatible approach
-            pdf_path = None
-            try:
-                logger.info("Attempting PDF to PNG conversion")
-                pdf_data = self.driver.execute_cdp_cmd("Page.printToPDF", {
-                    "printBackground": True, 
-                    "preferCSSPageSize": True,
-                    "marginTop": 0, 
-                    "marginBottom": 0, 
-                    "marginLeft": 0, 
-                    "marginRight": 0,
-                    "paperWidth": 8.27, 
-                    "paperHeight": 11.69, 
-                    "landscape": False
-                })
-                
-                # Create temporary PDF
-                base_name = os.path.splitext(filename)[0]
-                pdf_filename = f"temp_pdf_{base_name}.pdf"
-                pdf_path = os.path.join(os.getcwd(), pdf_filename)
-                
-                with open(pdf_path, "wb") as f:
-                    f.write(base64.b64decode(pdf_data["data"]))
-                logger.info(f"PDF saved: {pdf_path}")
-                
-                # Try Windows-compatible PDF conversion
-                png_path = None
-                
-                # Method 2a: Try PyMuPDF with proper error handling
-                try:
-                    import fitz
-                    logger.info("Attempting PyMuPDF conversion")
-                    
-                    # For Windows, try the most common working methods
-                    pdf_document = None
-                    try:
-                        pdf_document = fitz.open(pdf_path)
-                    except:
-                        try:
-                            pdf_document = fitz.Document(pdf_path)
-                        except:
-                            try:
-                                with open(pdf_path, 'rb') as pdf_file:
-                                    pdf_data = pdf_file.read()
-                                    pdf_document = fitz.open(stream=pdf_data)
-                            except:
-                                pass
-                    
-                    if pdf_document:
-                        page = pdf_document[0]  # Get first page
-                        
-                        # Create high-resolution pixmap
-                        mat = fitz.Matrix(2.0, 2.0)  # 2x zoom
-                        pix = page.get_pixmap(matrix=mat)
-                        
-                        if not filename.lower().endswith('.png'):
-                            filename = f"{os.path.splitext(filename)[0]}.png"
-                        
-                        png_path = os.path.join(CONFIG['STATIC_DIR'], filename)
-                        os.makedirs(CONFIG['STATIC_DIR'], exist_ok=True)
-                        
-                        # Save PNG
-                        pix.save(png_path)
-                        pdf_document.close()
-                        logger.info("PyMuPDF conversion successful")
-                    else:
-                        raise Exception("Could not open PDF with PyMuPDF")
-                        
-                except Exception as pymupdf_error:
-                    logger.warning(f"PyMuPDF failed: {pymupdf_error}")
-                    png_path = None
-                
-                # Method 2b: Try Pillow with wand (ImageMagick Python binding)
-                if png_path is None:
-                    try:
-                        from wand.image import Image as WandImage
-                        logger.info("Attempting conversion with Wand")
-                        
-                        if not filename.lower().endswith('.png'):
-                            filename = f"{os.path.splitext(filename)[0]}.png"
-                        
-                        png_path = os.path.join(CONFIG['STATIC_DIR'], filename)
-                        os.makedirs(CONFIG['STATIC_DIR'], exist_ok=True)
-                        
-                        with WandImage(filename=pdf_path, resolution=300) as img:
-                            img.format = 'png'
-                            img.save(filename=png_path)
-                        
-                        logger.info("Wand conversion successful")
-                        
-                    except Exception as wand_error:
-                        logger.warning(f"Wand conversion failed: {wand_error}")
-                        png_path = None
-                
-                # Method 2c: Try pdf2image with custom poppler path
-                if png_path is None:
-                    try:
-                        from pdf2image import convert_from_path
-                        logger.info("Attempting pdf2image with custom settings")
-                        
-                        # Try with different poppler configurations
-                        poppler_paths = [
-                            None,  # Default path
-                            r"C:\Program Files\poppler\bin",
-                            r"C:\poppler\bin",
-                            r".\poppler\bin"
-                        ]
-                        
-                        images = None
-                        for poppler_path in poppler_paths:
-                            try:
-                                if poppler_path:
-                                    images = convert_from_path(pdf_path, dpi=300, 
-                                                            poppler_path=poppler_path,
-                                                            first_page=1, last_page=1)
-                                else:
-                                    images = convert_from_path(pdf_path, dpi=300,
-                                                            first_page=1, last_page=1)
-                                break
-                            except Exception:
-                                continue
-                        
-                        if images:
-                            if not filename.lower().endswith('.png'):
-                                filename = f"{os.path.splitext(filename)[0]}.png"
-                            
-                            png_path = os.path.join(CONFIG['STATIC_DIR'], filename)
-                            os.makedirs(CONFIG['STATIC_DIR'], exist_ok=True)
-                            
-                            images[0].save(png_path, 'PNG', quality=95)
-                            logger.info("pdf2image conversion successful")
-                        else:
-                            raise Exception("No images generated")
-                            
-                    except Exception as pdf2image_error:
-                        logger.warning(f"pdf2image failed: {pdf2image_error}")
-                        png_path = None
-                
-                if png_path and os.path.exists(png_path):
-                    png_url = f"{CONFIG['HOST_URL']}/static/{filename}"
-                    logger.info(f"PNG saved: {png_path}")
-                    return png_path, png_url
-                else:
-                    raise Exception("All PDF conversion methods failed")
-                    
-            except Exception as pdf_error:
-                logger.error(f"PDF conversion failed: {pdf_error}")
-                return None, None
-                
-            finally:
-                # Clean up temporary PDF file
-                if pdf_path and os.path.exists(pdf_path):
-                    try:
-                        os.remove(pdf_path)
-                        logger.info(f"Removed temporary PDF: {pdf_path}")
-                    except Exception as e:
-                        logger.error(f"Failed to remove PDF: {e}")
-
-    def capture_page_as_png(self, filename: str) -> Tuple[Optional[str], Optional[str]]:
-        pdf_path = None
+    def _initiate_pdf(self) -> Optional[bytes]:
+        """Print the current page to PDF via CDP; the only step that needs the browser"""
         try:
             logger.info("Printing page as PDF")
             pdf_data = self.driver.execute_cdp_cmd("Page.printToPDF", {
@@ -394,57 +487,68 @@ class FormAutomationBase:
                 "paperHeight": 11.69, 
                 "landscape": False
             })
-            
-            # Ensure filename has .pdf extension for temp file
-            base_name = os.path.splitext(filename)[0]
-            pdf_filename = f"temp_pdf_{base_name}.pdf"
-            pdf_path = os.path.join(os.getcwd(), pdf_filename)
-            
-            with open(pdf_path, "wb") as f:
-                f.write(base64.b64decode(pdf_data["data"]))
-            logger.info(f"PDF saved: {pdf_path}")
-            
+            return base64.b64decode(pdf_data["data"])
+        except Exception as e:
+            logger.error(f"Failed to print page as PDF: {e}")
+            return None
+
+    def _capture_screenshot(self) -> Optional[bytes]:
+        """Capture the full page as PNG in a single CDP call, skipping the PDF round-trip"""
+        try:
+            logger.info("Capturing page screenshot")
+            screenshot = self.driver.execute_cdp_cmd("Page.captureScreenshot", {
+                "format": "png",
+                "captureBeyondViewport": True,
+                "fromSurface": True
+            })
+            return base64.b64decode(screenshot["data"])
+        except Exception as e:
+            logger.error(f"Failed to capture screenshot: {e}")
+            return None
+
+    @staticmethod
+    def _png_location(filename: str) -> Tuple[str, str]:
+        """Return the local path and public URL a screenshot is saved under"""
+        if not filename.lower().endswith('.png'):
+            filename = f"{os.path.splitext(filename)[0]}.png"
+        return os.path.join(CONFIG['STATIC_DIR'], filename), f"{CONFIG['HOST_URL']}/static/{filename}"
+
+    @staticmethod
+    def _render_png(pdf_bytes: bytes) -> Optional[bytes]:
+        """Rasterize the first PDF page to PNG bytes with PyMuPDF; does not touch the browser"""
+        try:
             logger.info("Converting PDF to PNG")
-            
-            # Ensure PyMuPDF is imported (should be at top of file)
-            import fitz
-            
-            pdf_document = fitz.open(pdf_path)  # fitz.open() is the correct method
-            page = pdf_document.load_page(0)
-            
-            # Higher resolution for better quality
-            mat = fitz.Matrix(3.0, 3.0)  # 3x zoom for better quality
-            pix = page.get_pixmap(matrix=mat)
-            
-            # Ensure filename has .png extension
-            if not filename.lower().endswith('.png'):
-                filename = f"{os.path.splitext(filename)[0]}.png"
-                
-            png_path = os.path.join(CONFIG['STATIC_DIR'], filename)
-            
-            # Ensure the static directory exists
+            with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf_document:
+                page = pdf_document.load_page(0)
+                mat = fitz.Matrix(CONFIG['SCREENSHOT_ZOOM'], CONFIG['SCREENSHOT_ZOOM'])
+                pix = page.get_pixmap(matrix=mat, alpha=False)
+                return pix.tobytes("png")
+        except Exception as e:
+            logger.error(f"Failed to render PNG: {e}")
+            return None
+
+    def _save_png(self, png_bytes: bytes, filename: str) -> Tuple[Optional[str], Optional[str]]:
+        """Write rendered PNG bytes into the static directory"""
+        try:
+            png_path, png_url = self._png_location(filename)
             os.makedirs(CONFIG['STATIC_DIR'], exist_ok=True)
-            
-            pix.save(png_path)
-            pdf_document.close()
-            
-            png_url = f"{CONFIG['HOST_URL']}/static/{filename}"
+            with open(png_path, "wb") as f:
+                f.write(png_bytes)
             logger.info(f"PNG saved: {png_path}")
-            
             return png_path, png_url
-            
         except Exception as e:
-            logger.error(f"Failed to capture PNG: {e}")
+            logger.error(f"Failed to save PNG: {e}")
             return None, None
-            
-        finally:
-            # Clean up temporary PDF file
-            if pdf_path and os.path.exists(pdf_path):
-                try:
-                    os.remove(pdf_path)
-                    logger.info(f"Removed temporary PDF: {pdf_path}")
-                except Exception as e:
-                    logger.error(f"Failed to remove PDF: {e}")
+
+    def capture_page_as_png(self, filename: str) -> Tuple[Optional[str], Optional[str]]:
+        if CONFIG['SCREENSHOT_METHOD'] == "screenshot":
+            png_bytes = self._capture_screenshot()
+        else:
+            pdf_bytes = self._initiate_pdf()
+            png_bytes = self._render_png(pdf_bytes) if pdf_bytes else None
+        if not png_bytes:
+            return None, None
+        return self._save_png(png_bytes, filename)
 
     def cleanup(self):
         """Clean up browser resources"""
@@ -455,6 +559,108 @@ class FormAutomationBase:
             except Exception as e:
                 logger.error(f"Error closing browser: {e}")
 
+# Browser pool shared across requests
+class DriverPool:
+    """Bounded pool of ready browser instances, so runs skip Chrome cold start"""
+
+    def __init__(self, factory: Callable[[], Any], size: int):
+        self.factory = factory
+        self.size = size
+        self._queue: Optional[asyncio.Queue] = None
+        self._created = 0
+        self._replacing: set = set()
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        return self._queue
+
+    async def _spawn(self):
+        self._created += 1
+        try:
+            return await asyncio.to_thread(self.factory)
+        except Exception:
+            self._created -= 1
+            raise
+
+    async def warm(self):
+        """Pre-launch browsers up to the pool size"""
+        while self._created < self.size:
+            self.queue.put_nowait(await self._spawn())
+        logger.info(f"Driver pool warmed with {self.size} browser(s)")
+
+    async def acquire(self):
+        while True:
+            if self.queue.empty() and self._created < self.size:
+                return await self._spawn()
+            driver = await self.queue.get()
+            if driver is not None:
+                return driver
+            # None marks a slot freed by a failed replacement; loop round to spawn into it
+
+    async def release(self, driver, discard: bool = False):
+        """Reset a browser's session state off the event loop and make it available again.
+
+        Browsers from failed runs are discarded instead and replaced with a fresh one
+        in the background, so the caller does not wait for a Chrome cold start.
+        """
+        if not discard:
+            try:
+                await asyncio.to_thread(self._reset, driver)
+                self.queue.put_nowait(driver)
+                return
+            except Exception as e:
+                logger.warning(f"Discarding browser that failed to reset: {e}")
+        task = asyncio.create_task(self._replace(driver))
+        self._replacing.add(task)
+        task.add_done_callback(self._replacing.discard)
+
+    async def _replace(self, driver):
+        """Swap a discarded browser for a new one; the slot stays counted until that fails"""
+        await asyncio.to_thread(self._quit, driver)
+        try:
+            replacement = await asyncio.to_thread(self.factory)
+        except Exception as e:
+            self._created -= 1
+            logger.error(f"Failed to replace discarded browser: {e}")
+            # Wake a request already waiting on the queue so it can spawn a browser itself
+            self.queue.put_nowait(None)
+            return
+        # Refill the slot so requests already waiting on the queue are not stranded
+        self.queue.put_nowait(replacement)
+
+    @staticmethod
+    def _reset(driver):
+        # Clears cookies for every domain, not just the page currently loaded
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.get("about:blank")
+        if CONFIG['BLOCK_IMAGES']:
+            set_image_blocking(driver, True)
+
+    def discard(self, driver):
+        self._created -= 1
+        self._quit(driver)
+
+    def close(self):
+        while not self.queue.empty():
+            driver = self.queue.get_nowait()
+            if driver is not None:
+                self.discard(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+            logger.info("Browser closed")
+        except Exception as e:
+            logger.error(f"Error closing browser: {e}")
+        # Drop the process handle now so chromedriver's port is freed without waiting on GC
+        try:
+            del driver.service.process
+        except AttributeError:
+            pass
+
 # EIN-specific automation class
 class IRSEINAutomation(FormAutomationBase):
     STATE_MAPPING = {
@@ -548,78 +754,121 @@ class IRSEINAutomation(FormAutomationBase):
         "Non-Profit/Tax-Exempt Organization": "nonprofit",
         "Other": "other_option"
     }
+
+    # Case-insensitive views of the entity-type keyed mappings, built once
+    _ENTITY_TYPE_MAPPING_CI = {k.lower(): v for k, v in ENTITY_TYPE_MAPPING.items()}
+    _SUB_TYPE_MAPPING_CI = {k.lower(): v for k, v in SUB_TYPE_MAPPING.items()}
+
+    _NONPROFIT_KEYWORDS = frozenset({"non-profit", "nonprofit", "charity", "charitable", "501(c)", "tax-exempt"})
+    _NONPROFIT_RE = re.compile("|".join(map(re.escape, sorted(_NONPROFIT_KEYWORDS))))
     
     def __init__(self):
-        super().__init__(headless=False, timeout=10)
+        super().__init__(headless=CONFIG['HEADLESS'], timeout=10)
+
+    @classmethod
+    @functools.lru_cache(maxsize=256)
+    def _resolve_entity(cls, entity_type: str, business_desc: str) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+        """Map an entity type to (mapped_type, radio_id, sub_type, sub_type_radio_id).
+
+        sub_type and sub_type_radio_id are None for types without a sub-type page (LLC, Estate).
+        """
+        entity_key = entity_type.lower()
+        mapped_type = cls._ENTITY_TYPE_MAPPING_CI.get(entity_key)
+        radio_id = cls.RADIO_BUTTON_MAPPING.get(mapped_type)
+        if mapped_type in ("Limited Liability Company (LLC)", "Estate"):
+            return mapped_type, radio_id, None, None
+        sub_type = cls._SUB_TYPE_MAPPING_CI.get(entity_key, "Other")
+        if entity_key == "non-profit corporation":
+            sub_type = "Non-Profit/Tax-Exempt Organization" if cls._NONPROFIT_RE.search(business_desc) else "Other"
+        return mapped_type, radio_id, sub_type, cls.SUB_TYPE_BUTTON_MAPPING.get(sub_type, "other_option")
     
-    def initialize_driver(self):
-        try:
-            options = uc.ChromeOptions()
-            if self.headless:
-                options.add_argument('--headless')
-            options.add_argument('--disable-gpu')
+    @staticmethod
+    def create_driver(headless: bool = True):
+        """Launch a configured Chrome instance; used by the driver pool"""
+        options = uc.ChromeOptions()
+        if headless:
             options.add_argument('--headless')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            options.add_argument('--disable-infobars')
-            options.add_argument('--window-size=1920,1080')
-            options.add_argument('--start-maximized')
-            prefs = {
-                "profile.default_content_setting_values": {
-                    "popups": 2, "notifications": 2, "geolocation": 2,
-                },
-                "credentials_enable_service": False,
-                "profile.password_manager_enabled": False,
-                "autofill.profile_enabled": False,
-                "autofill.credit_card_enabled": False,
-                "password_manager_enabled": False,
-                "profile.password_dismissed_save_prompt": True
-            }
-            options.add_experimental_option("prefs", prefs)
-            self.driver = uc.Chrome(options=options)
-            self.wait = WebDriverWait(self.driver, self.timeout)
-            self.driver.execute_script("""
-                window.alert = function() { return true; };
-                window.confirm = function() { return true; };
-                window.prompt = function() { return null; };
-                window.open = function() { return null; };
-            """)
-            logger.info("WebDriver initialized successfully")
+        options.add_argument('--disable-gpu')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_argument('--disable-infobars')
+        options.add_argument('--window-size=1920,1080')
+        options.add_argument('--start-maximized')
+        prefs = {
+            "profile.default_content_setting_values": {
+                "popups": 2, "notifications": 2, "geolocation": 2,
+            },
+            "credentials_enable_service": False,
+            "profile.password_manager_enabled": False,
+            "autofill.profile_enabled": False,
+            "autofill.credit_card_enabled": False,
+            "password_manager_enabled": False,
+            "profile.password_dismissed_save_prompt": True
+        }
+        options.add_experimental_option("prefs", prefs)
+        # driver.get returns on DOMContentLoaded; explicit waits cover anything later
+        options.page_load_strategy = "eager"
+        driver = uc.Chrome(options=options)
+        # Explicit waits only: an implicit wait would compound with every WebDriverWait poll
+        driver.implicitly_wait(0)
+        if CONFIG['BLOCK_IMAGES']:
+            # The flow locates everything by ID/selector, so decorative images are dead weight until the capture
+            driver.execute_cdp_cmd("Network.enable", {})
+            set_image_blocking(driver, True)
+        driver.execute_script("""
+            window.alert = function() { return true; };
+            window.confirm = function() { return true; };
+            window.prompt = function() { return null; };
+            window.open = function() { return null; };
+        """)
+        logger.info("WebDriver initialized successfully")
+        return driver
+
+    async def acquire_driver(self):
+        """Check a warm browser out of the shared pool for this run"""
+        try:
+            self.driver = await DRIVER_POOL.acquire()
+            self.wait = WebDriverWait(self.driver, self.timeout, poll_frequency=0.1,
+                                      ignored_exceptions=(NoSuchElementException, StaleElementReferenceException))
+            # Fields are on an already-loaded page; fail fast so applicant fallbacks kick in sooner
+            self._fast_wait = WebDriverWait(self.driver, 5, poll_frequency=0.1,
+                                            ignored_exceptions=(NoSuchElementException, StaleElementReferenceException))
+            logger.info("WebDriver acquired from pool")
         except Exception as e:
             logger.error(f"Failed to initialize WebDriver: {e}")
             raise
+
+    async def release_driver(self, discard: bool = False):
+        """Return the browser to the shared pool instead of quitting it"""
+        driver, self.driver = self.driver, None
+        if driver:
+            await DRIVER_POOL.release(driver, discard)
+            logger.info("Browser discarded" if discard else "Browser returned to pool")
     
     def navigate_and_fill_form(self, data: CaseData):
+        entity_state_norm = self.normalize_state(data.entity_state)
+        county_norm = self.normalize_state(data.county)
         try:
             self.driver.get("https://sa.www4.irs.gov/modiein/individual/index.jsp")
             logger.info("Navigated to IRS EIN form")
-            if not self.click_button((By.XPATH, "//input[@type='submit' and @name='submit' and @value='Begin Application >>']"), "Begin Application"):
+            if not self.click_button(BEGIN_BTN, "Begin Application"):
                 raise Exception("Failed to begin application")
-            self.wait.until(EC.presence_of_element_located((By.ID, "individual-leftcontent")))
-            entity_type = data.entity_type.strip()
-            mapped_type = self.ENTITY_TYPE_MAPPING.get(entity_type)
-            radio_id = self.RADIO_BUTTON_MAPPING.get(mapped_type)
+            self.wait.until(EC.presence_of_element_located(ENTITY_TYPE_PAGE))
+            mapped_type, radio_id, sub_type, sub_type_radio_id = self._resolve_entity(
+                data.entity_type.strip(), (data.business_description or "").lower()
+            )
             if not self.select_radio(radio_id, f"Entity type: {mapped_type}"):
                 raise Exception(f"Failed to select entity type: {mapped_type}")
-            if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue"):
+            if not self.click_button(CONTINUE_BTN, "Continue"):
                 raise Exception("Failed to continue after entity type selection")
-            if mapped_type not in ["Limited Liability Company (LLC)", "Estate"]:
-                sub_type = self.SUB_TYPE_MAPPING.get(entity_type, "Other")
-                if entity_type == "Non-Profit Corporation":
-                    business_desc = (data.business_description or "").lower()
-                    nonprofit_keywords = ["non-profit", "nonprofit", "charity", "charitable", "501(c)", "tax-exempt"]
-                    sub_type = "Non-Profit/Tax-Exempt Organization" if any(keyword in business_desc for keyword in nonprofit_keywords) else "Other"
-                sub_type_radio_id = self.SUB_TYPE_BUTTON_MAPPING.get(sub_type, "other_option")
+            if sub_type is not None:
                 if not self.select_radio(sub_type_radio_id, f"Sub-type: {sub_type}"):
                     raise Exception(f"Failed to select sub-type: {sub_type}")
-                if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue sub-type (first click)"):
-                    raise Exception("Failed to continue after sub-type selection (first click)")
-                time.sleep(0.5)
-                if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue sub-type (second click)"):
-                    raise Exception("Failed to continue after sub-type selection (second click)")
+                if not self.advance_two_pages(CONTINUE_BTN, desc="Continue sub-type"):
+                    raise Exception("Failed to continue after sub-type selection")
             else:
-                if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue after entity type"):
+                if not self.click_button(CONTINUE_BTN, "Continue after entity type"):
                     raise Exception("Failed to continue after entity type")
             if mapped_type == "Limited Liability Company (LLC)":
                 llc_members = 1
@@ -630,100 +879,72 @@ class IRSEINAutomation(FormAutomationBase):
                             llc_members = 1
                     except (ValueError, TypeError):
                         pass
-                field = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//input[@id='numbermem' or @name='numbermem']")))
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", field)
-                field.clear()
-                time.sleep(0.2)
-                field.send_keys(str(llc_members))
-                state_value = self.normalize_state(data.entity_state or data.entity_state_record_state)
-                if not self.select_dropdown((By.ID, "state"), state_value, "State"):
+                field = self.wait.until(EC.element_to_be_clickable(LLC_MEMBERS))
+                self.type_into(field, str(llc_members))
+                state_value = entity_state_norm if data.entity_state else self.normalize_state(data.entity_state_record_state)
+                if not self.select_dropdown(LLC_STATE, state_value, "State"):
                     raise Exception(f"Failed to select state: {state_value}")
-                if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue"):
+                if not self.click_button(CONTINUE_BTN, "Continue"):
                     raise Exception("Failed to continue after LLC members and state")
             specific_states = {"AZ", "CA", "ID", "LA", "NV", "NM", "TX", "WA", "WI"}
             if mapped_type == "Limited Liability Company (LLC)" and state_value in specific_states:
                 if not self.select_radio("radio_n", "Non-partnership LLC option"):
                     raise Exception("Failed to select non-partnership LLC option")
-                if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue after radio_n"):
+                if not self.click_button(CONTINUE_BTN, "Continue after radio_n"):
                     raise Exception("Failed to continue after non-partnership LLC option")
-                if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue after confirmation"):
+                if not self.click_button(CONTINUE_BTN, "Continue after confirmation"):
                     raise Exception("Failed to continue after confirmation")
             else:
-                if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue after LLC"):
+                if not self.click_button(CONTINUE_BTN, "Continue after LLC"):
                     raise Exception("Failed to continue after LLC")
             if not self.select_radio("newbiz", "New Business"):
                 raise Exception("Failed to select new business")
-            if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue"):
+            if not self.click_button(CONTINUE_BTN, "Continue"):
                 raise Exception("Failed to continue after business purpose")
             defaults = self._get_defaults(data)
             first_name = data.entity_members.get("first_name_1", defaults["first_name"]) if data.entity_members else defaults["first_name"]
             last_name = data.entity_members.get("last_name_1", defaults["last_name"]) if data.entity_members else defaults["last_name"]
-            # Try responsibleParty fields first, fallback to applicant fields
-            first_name_filled = self.fill_field((By.ID, "responsiblePartyFirstName"), first_name, "First Name")
-            if not first_name_filled:
-                first_name_filled = self.fill_field((By.ID, "applicantFirstName"), first_name, "First Name (Applicant)")
-            if not first_name_filled:
-                raise Exception(f"Failed to fill First Name: {first_name}")
-                
-            last_name_filled = self.fill_field((By.ID, "responsiblePartyLastName"), last_name, "Last Name")
-            if not last_name_filled:
-                last_name_filled = self.fill_field((By.ID, "applicantLastName"), last_name, "Last Name (Applicant)")
-            if not last_name_filled:
-                raise Exception(f"Failed to fill Last Name: {last_name}")
-                
             ssn = defaults["ssn_decrypted"].replace("-", "")
-            ssn_first_filled = self.fill_field((By.ID, "responsiblePartySSN3"), ssn[:3], "SSN First 3")
-            if not ssn_first_filled:
-                ssn_first_filled = self.fill_field((By.ID, "applicantSSN3"), ssn[:3], "SSN First 3 (Applicant)")
-            if not ssn_first_filled:
-                raise Exception("Failed to fill SSN First 3")
-                
-            ssn_middle_filled = self.fill_field((By.ID, "responsiblePartySSN2"), ssn[3:5], "SSN Middle 2")
-            if not ssn_middle_filled:
-                ssn_middle_filled = self.fill_field((By.ID, "applicantSSN2"), ssn[3:5], "SSN Middle 2 (Applicant)")
-            if not ssn_middle_filled:
-                raise Exception("Failed to fill SSN Middle 2")
-                
-            ssn_last_filled = self.fill_field((By.ID, "responsiblePartySSN4"), ssn[5:], "SSN Last 4")
-            if not ssn_last_filled:
-                ssn_last_filled = self.fill_field((By.ID, "applicantSSN4"), ssn[5:], "SSN Last 4 (Applicant)")
-            if not ssn_last_filled:
-                raise Exception("Failed to fill SSN Last 4")
+            # Try responsibleParty fields first, fallback to applicant fields
+            missing = self._bulk_fill({
+                FIRST_NAME_IDS: first_name,
+                LAST_NAME_IDS: last_name,
+                SSN3_IDS: ssn[:3],
+                SSN2_IDS: ssn[3:5],
+                SSN4_IDS: ssn[5:],
+            }, "Responsible party")
+            if missing:
+                raise Exception(f"Failed to fill responsible party fields: {', '.join(missing)}")
             if not self.select_radio("iamsole", "I Am Sole"):
                 raise Exception("Failed to select I Am Sole")
-            if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue"):
+            if not self.click_button(CONTINUE_BTN, "Continue"):
                 raise Exception("Failed to continue after responsible party")
-            if not self.fill_field((By.ID, "physicalAddressStreet"), defaults["business_address_1"], "Physical Street"):
-                raise Exception("Failed to fill Physical Street")
-            if not self.fill_field((By.ID, "physicalAddressCity"), defaults["city"], "Physical City"):
-                raise Exception("Failed to fill Physical City")
-            if not self.select_dropdown((By.ID, "physicalAddressState"), self.normalize_state(data.entity_state), "Physical State"):
-                raise Exception("Failed to select Physical State")
-            if not self.fill_field((By.ID, "physicalAddressZipCode"), defaults["zip_code"], "Physical Zip"):
-                raise Exception("Failed to fill Physical Zip")
+            physical_fields = {
+                PHYS_STREET[1]: defaults["business_address_1"],
+                PHYS_CITY[1]: defaults["city"],
+                PHYS_ZIP[1]: defaults["zip_code"],
+            }
             phone = defaults["phone"] or "2812173123"
-            phone_clean = re.sub(r'\D', '', phone)
+            phone_clean = _NONDIGIT.sub('', phone)
             if len(phone_clean) == 10:
-                if not self.fill_field((By.ID, "phoneFirst3"), phone_clean[:3], "Phone First 3"):
-                    raise Exception("Failed to fill Phone First 3")
-                if not self.fill_field((By.ID, "phoneMiddle3"), phone_clean[3:6], "Phone Middle 3"):
-                    raise Exception("Failed to fill Phone Middle 3")
-                if not self.fill_field((By.ID, "phoneLast4"), phone_clean[6:10], "Phone Last 4"):
-                    raise Exception("Failed to fill Phone Last 4")
+                physical_fields.update({
+                    PHONE_FIRST3[1]: phone_clean[:3],
+                    PHONE_MIDDLE3[1]: phone_clean[3:6],
+                    PHONE_LAST4[1]: phone_clean[6:10],
+                })
+            missing = self._bulk_fill(physical_fields, "Physical address")
+            if missing:
+                raise Exception(f"Failed to fill physical address fields: {', '.join(missing)}")
+            if not self.select_dropdown(PHYS_STATE, entity_state_norm, "Physical State"):
+                raise Exception("Failed to select Physical State")
             if data.care_of_name:
-                try:
-                    self.wait.until(EC.presence_of_element_located((By.ID, "physicalAddressCareofName")))
-                    if not self.fill_field((By.ID, "physicalAddressCareofName"), data.care_of_name, "Physical Care of Name"):
-                        logger.warning("Failed to fill Physical Care of Name, proceeding")
-                except Exception as e:
-                    logger.info(f"physicalAddressCareofName field not found or not fillable: {e}")
+                if not self.fill_field(PHYS_CARE_OF_NAME, data.care_of_name, "Physical Care of Name",
+                                       wait=WebDriverWait(self.driver, 2, poll_frequency=0.1)):
+                    logger.info("physicalAddressCareofName field not found or not fillable, proceeding")
                 # Mailing address handling
             mailing_address = data.mailing_address or {}
             # Check if mailing address fields are non-empty
-            has_mailing_address = any(
-                mailing_address.get(key, "").strip()
-                for key in ["mailingStreet", "mailingCity", "mailingState", "mailingZip"]
-            )
+            has_mailing_address = any((value := mailing_address.get(key)) and value.strip() for key in _MAILING_KEYS)
             
             if has_mailing_address:
                 if not self.select_radio("radioAnotherAddress_y", "Address option (Yes)"):
@@ -732,128 +953,111 @@ class IRSEINAutomation(FormAutomationBase):
                 if not self.select_radio("radioAnotherAddress_n", "Address option (No)"):
                     raise Exception("Failed to select Address option (No)")
             
-            if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue after address option"):
+            if not self.click_button(CONTINUE_BTN, "Continue after address option"):
                 raise Exception("Failed to continue after address option")
             
             try:
-                if not self.click_button((By.XPATH, "//input[@type='submit' and @name='Submit' and @value='Accept As Entered']"), "Accept As Entered"):
+                if not self.click_button(ACCEPT_AS_ENTERED_BTN, "Accept As Entered"):
                     raise Exception("Failed to click Accept As Entered")
             except Exception as e:
                 logger.info(f"Accept As Entered button not found or not clickable, proceeding: {e}")
             
             if has_mailing_address:
-                if not self.fill_field((By.ID, "mailingAddressStreet"), mailing_address.get("mailingStreet", ""), "Mailing Street"):
-                    raise Exception("Failed to fill Mailing Street")
-                if not self.fill_field((By.ID, "mailingAddressCity"), mailing_address.get("mailingCity", ""), "Mailing City"):
-                    raise Exception("Failed to fill Mailing City")
-                if not self.fill_field((By.ID, "mailingAddressState"), mailing_address.get("mailingState", ""), "Mailing State"):
+                missing = self._bulk_fill({
+                    MAIL_STREET[1]: mailing_address.get("mailingStreet", ""),
+                    MAIL_CITY[1]: mailing_address.get("mailingCity", ""),
+                    MAIL_ZIP[1]: mailing_address.get("mailingZip", ""),
+                }, "Mailing address")
+                if missing:
+                    raise Exception(f"Failed to fill mailing address fields: {', '.join(missing)}")
+                mailing_state = mailing_address.get("mailingState") or ""
+                if not mailing_state.strip() or not self.select_dropdown(MAIL_STATE, self.normalize_state(mailing_state), "Mailing State"):
                     raise Exception("Failed to select Mailing State")
-                if not self.fill_field((By.ID, "mailingAddressPostalCode"), mailing_address.get("mailingZip", ""), "Mailing Zip"):
-                    raise Exception("Failed to fill Mailing Zip")
-                if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue after mailing address"):
+                if not self.click_button(CONTINUE_BTN, "Continue after mailing address"):
                     raise Exception("Failed to continue after mailing address")
                 try:
-                    if not self.click_button((By.XPATH, "//input[@type='submit' and @name='Submit' and @value='Accept As Entered']"), "Accept As Entered"):
+                    if not self.click_button(ACCEPT_AS_ENTERED_BTN, "Accept As Entered"):
                         raise Exception("Failed to click Accept As Entered")
                 except Exception as e:
                     logger.info(f"Accept As Entered button not found or not clickable, proceeding: {e}")
             try:
                 business_name = defaults["entity_name"]
-                for ending in ['Corp', 'Inc', 'LLC', 'LC', 'PLLC', 'PA']:
-                    if business_name.upper().endswith(ending.upper()):
-                        business_name = business_name[:-(len(ending))].strip()
-                business_name = re.sub(r'[^\w\s\-&]', '', business_name)
+                business_name_upper = business_name.upper()
+                for ending in _NAME_SUFFIXES:
+                    if business_name_upper.endswith(ending):
+                        business_name = business_name[:-len(ending)].strip()
+                        break
+                business_name = _NAME_CLEAN.sub('', business_name)
             except Exception as e:
                 logger.error(f"Failed to process business name: {e}")
                 business_name = defaults["entity_name"]  # Fallback to original
             try:
-                if not self.fill_field((By.CSS_SELECTOR, "input#businessOperationalLegalName"), business_name, "Legal Business Name"):
+                if not self.fill_field(BUSINESS_LEGAL_NAME, business_name, "Legal Business Name"):
                     logger.info("Failed to fill Legal Business Name via CSS selector, ignoring and proceeding")
             except Exception as e:
                 logger.info(f"Legal Business Name field not found or not fillable: {e}, ignoring and proceeding")
-            if not self.fill_field((By.ID, "businessOperationalCounty"), self.normalize_state(data.entity_state), "County"):
+            if not self.fill_field(BUSINESS_COUNTY, entity_state_norm, "County"):
                 raise Exception("Failed to fill County")
             try:
-                if self.select_dropdown((By.ID, "articalsFiledState"), self.normalize_state(data.county), "Articles Filed State"):
+                if self.select_dropdown(ARTICLES_FILED_STATE, county_norm, "Articles Filed State"):
                     logger.info("Successfully selected Articles Filed State with ID 'articalsFiledState'")
                 else:
                     logger.info("Failed to select Articles Filed State with ID 'articalsFiledState', trying 'businessOperationalState'")
-                    if not self.select_dropdown((By.ID, "businessOperationalState"), self.normalize_state(data.county), "Business Operational State"):
+                    if not self.select_dropdown(BUSINESS_STATE, county_norm, "Business Operational State"):
                         logger.info("Failed to select Business Operational State, ignoring and proceeding")
             except Exception as e:
                 logger.info(f"Articles Filed State dropdown not found or not selectable: {e}, ignoring and proceeding")
             if data.trade_name:
-                if not self.fill_field((By.ID, "businessOperationalTradeName"), data.trade_name, "Trade Name"):
+                if not self.fill_field(BUSINESS_TRADE_NAME, data.trade_name, "Trade Name"):
                     raise Exception("Failed to fill Trade Name")
                 
             month, year = self.parse_formation_date(defaults["formation_date"])
-            if not self.select_dropdown((By.ID, "BUSINESS_OPERATIONAL_MONTH_ID"), str(month), "Formation Month"):
+            if not self.select_dropdown(FORMATION_MONTH, str(month), "Formation Month"):
                 raise Exception("Failed to select Formation Month")
-            if not self.fill_field((By.ID, "BUSINESS_OPERATIONAL_YEAR_ID"), str(year), "Formation Year"):
+            if not self.fill_field(FORMATION_YEAR, str(year), "Formation Year"):
                 raise Exception("Failed to fill Formation Year")
             
             if data.closing_month:
-                MONTH_MAPPING = {
-                    "january": "JANUARY", "jan": "JANUARY", "1": "JANUARY",
-                    "february": "FEBRUARY", "feb": "FEBRUARY", "2": "FEBRUARY",
-                    "march": "MARCH", "mar": "MARCH", "3": "MARCH",
-                    "april": "APRIL", "apr": "APRIL", "4": "APRIL",
-                    "may": "MAY", "5": "MAY",
-                    "june": "JUNE", "jun": "JUNE", "6": "JUNE",
-                    "july": "JULY", "jul": "JULY", "7": "JULY",
-                    "august": "AUGUST", "aug": "AUGUST", "8": "AUGUST",
-                    "september": "SEPTEMBER", "sep": "SEPTEMBER", "9": "SEPTEMBER",
-                    "october": "OCTOBER", "oct": "OCTOBER", "10": "OCTOBER",
-                    "november": "NOVEMBER", "nov": "NOVEMBER", "11": "NOVEMBER",
-                    "december": "DECEMBER", "dec": "DECEMBER", "12": "DECEMBER"
-                }
-                normalized_month = MONTH_MAPPING.get(data.closing_month.lower().strip(), None)
+                normalized_month = _MONTH_MAPPING.get(data.closing_month.lower().strip(), None)
                 if normalized_month:
-                    retries = 2
-                    for attempt in range(1):
-                        try:
-                            dropdown = self.wait.until(EC.element_to_be_clickable((By.ID, "fiscalMonth")))
-                            select = Select(dropdown)
-                            available_options = [option.text for option in select.options]
-                            if normalized_month not in available_options:
-                                logger.warning(f"Fiscal Month {normalized_month} not in available options: {available_options}")
-                                break
-                            
-                            select.select_by_visible_text(normalized_month)
+                    try:
+                        dropdown = WebDriverWait(self.driver, 3, poll_frequency=0.1).until(EC.element_to_be_clickable(FISCAL_MONTH))
+                        available_options = set(self.driver.execute_script(self.OPTION_TEXTS_SCRIPT, dropdown))
+                        if normalized_month not in available_options:
+                            logger.warning(f"Fiscal Month {normalized_month} not in available options: {sorted(available_options)}")
+                        else:
+                            from selenium.webdriver.support.ui import Select
+                            Select(dropdown).select_by_visible_text(normalized_month)
                             logger.info(f"Selected Fiscal Month: {normalized_month}")
-                            break
-                        except Exception as e:
-                            if attempt < retries:
-                                logger.warning(f"Attempt {attempt + 1} to select Fiscal Month failed: {e}, retrying...")
-                                time.sleep(1)
-                            else:
-                                logger.error(f"Failed to select Fiscal Month {normalized_month} after {retries + 1} attempts: {e}")
-                                break
+                    except TimeoutException:
+                        logger.warning(f"Fiscal Month dropdown not available, skipping {normalized_month}")
+                    except Exception as e:
+                        logger.error(f"Failed to select Fiscal Month {normalized_month}: {e}")
                 else:
                     logger.warning(f"Invalid or unmapped closing_month: {data.closing_month}, skipping fiscal month selection")
-            if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue"):
+            if not self.click_button(CONTINUE_BTN, "Continue"):
                 raise Exception("Failed to continue after formation date")
 
-            for radio in [
+            unchecked = self._bulk_click_radios([
                 "radioTrucking_n",
                 "radioInvolveGambling_n",
                 "radioExciseTax_n",
                 "radioSellTobacco_n",
                 "radioHasEmployees_n"
-            ]:
-                if not self.select_radio(radio, radio):
-                    raise Exception(f"Failed to select {radio}")
-            if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue"):
+            ], "business activity (No) options")
+            if unchecked:
+                raise Exception(f"Failed to select {', '.join(unchecked)}")
+            if not self.click_button(CONTINUE_BTN, "Continue"):
                 raise Exception("Failed to continue after formation date")
             if not self.select_radio("other", "Other activity"):
                 raise Exception("Failed to select Other activity")
-            if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue"):
+            if not self.click_button(CONTINUE_BTN, "Continue"):
                 raise Exception("Failed to continue after primary activity")
             if not self.select_radio("other", "Other service"):
                 raise Exception("Failed to select Other service")
-            if not self.fill_field((By.ID, "pleasespecify"), defaults["business_description"], "Business Description"):
+            if not self.fill_field(BUSINESS_DESCRIPTION, defaults["business_description"], "Business Description"):
                 raise Exception("Failed to fill Business Description")
-            if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue"):
+            if not self.click_button(CONTINUE_BTN, "Continue"):
                 raise Exception("Failed to continue after specify service")
             if not self.select_radio("receiveonline", "Receive Online"):
                 raise Exception("Failed to select Receive Online")
@@ -863,163 +1067,157 @@ class IRSEINAutomation(FormAutomationBase):
             raise
     
     def normalize_state(self, state: str) -> str:
-        if not state:
-            return "TX"
-        state_clean = state.upper().strip()
-        return self.STATE_MAPPING.get(state_clean, state_clean if len(state_clean) == 2 else "TX")
+        state_clean = (state or "").upper().strip()
+        return self.STATE_MAPPING.get(state_clean) or (state_clean if len(state_clean) == 2 else "TX")
     
     def parse_formation_date(self, date_str: str) -> Tuple[int, int]:
-        if not date_str:
+        match = _DATE_RE.fullmatch(date_str.strip()) if date_str else None
+        if not match:
             return 6, 2024
-        formats = ["%Y-%m-%d", "%m/%d/%Y", "%Y/%m/%d"]
-        for fmt in formats:
-            try:
-                parsed = datetime.strptime(date_str.strip(), fmt)
-                return parsed.month, parsed.year
-            except ValueError:
-                continue
-        return 6, 2024
+        year, _, month, day, us_month, us_day, us_year = match.groups()
+        if year:
+            month, day, year = int(month), int(day), int(year)
+        else:
+            month, day, year = int(us_month), int(us_day), int(us_year)
+        if year < 1 or not 1 <= month <= 12 or not 1 <= day <= calendar.monthrange(year, month)[1]:
+            return 6, 2024
+        return month, year
     
-    def upload_screenshot_to_azure_sync(self, entity_process_id: str, legal_name: str, png_path: str) -> Optional[str]:
+    @staticmethod
+    def _screenshot_blob_name(entity_process_id: str, legal_name: str) -> str:
+        clean_legal_name = _BLOB_CLEAN.sub('', legal_name)
+        return f"{entity_process_id}/{clean_legal_name}EINScreenshot.png"
+
+    async def upload_screenshot_to_azure(self, entity_process_id: str, legal_name: str, png_data: bytes) -> Optional[str]:
         try:
-            clean_legal_name = re.sub(r'[^\w\-]', '', legal_name.replace(" ", ""))
-            blob_name = f"{entity_process_id}/{clean_legal_name}EINScreenshot.png"
-            connection_string = f"DefaultEndpointsProtocol=https;AccountName={CONFIG['AZURE_STORAGE_ACCOUNT_NAME']};AccountKey={CONFIG['AZURE_ACCESS_KEY']};EndpointSuffix=core.windows.net"
-            blob_service_client = BlobServiceClient.from_connection_string(connection_string)
-            container_client = blob_service_client.get_container_client(CONFIG['AZURE_CONTAINER_NAME'])
-            with open(png_path, "rb") as data:
-                container_client.upload_blob(name=blob_name, data=data, overwrite=True)
-            blob_url = f"https://{CONFIG['AZURE_STORAGE_ACCOUNT_NAME']}.blob.core.windows.net/{CONFIG['AZURE_CONTAINER_NAME']}/{blob_name}"
+            blob_name = self._screenshot_blob_name(entity_process_id, legal_name)
+            await blob_container().upload_blob(name=blob_name, data=png_data, length=len(png_data), overwrite=True,
+                                               max_concurrency=4, content_settings=content_settings("image/png"))
+            blob_url = blob_url_for(blob_name)
             logger.info(f"Screenshot uploaded to Azure Blob Storage: {blob_url}")
             return blob_url
         except Exception as e:
             logger.error(f"Failed to upload screenshot to Azure Blob Storage: {e}")
             return None
 
-    def _save_json_data_sync(self, data: Dict[str, Any]) -> bool:
+    async def _store_screenshot(self, capture: bytes, filename: str, entity_process_id: str, legal_name: str) -> Optional[str]:
+        """Render (if needed), save and upload a captured page; safe to run after the browser is gone"""
+        if CONFIG['SCREENSHOT_METHOD'] == "screenshot":
+            png_bytes = capture
+        else:
+            png_bytes = await asyncio.to_thread(self._render_png, capture)
+        if not png_bytes:
+            return None
+        png_path, _ = await asyncio.to_thread(self._save_png, png_bytes, filename)
+        if png_path:
+            remember_screenshot(entity_process_id, png_path)
+        return await self.upload_screenshot_to_azure(entity_process_id, legal_name, png_bytes)
+
+    async def _save_json_data(self, data: Dict[str, Any]) -> bool:
         try:
-            legal_name = data.get('entity_name', 'UnknownEntity')
-            clean_legal_name = re.sub(r'[^\w\-]', '', legal_name.replace(" ", ""))
+            legal_name = data.get('entity_name') or 'UnknownEntity'
+            clean_legal_name = _BLOB_CLEAN.sub('', legal_name)
             blob_name = f"{data['record_id']}/{clean_legal_name}_data.json"
-            json_data = json.dumps(data, indent=2)
-            connection_string = f"DefaultEndpointsProtocol=https;AccountName={CONFIG['AZURE_STORAGE_ACCOUNT_NAME']};AccountKey={CONFIG['AZURE_ACCESS_KEY']};EndpointSuffix=core.windows.net"
-            blob_service_client = BlobServiceClient.from_connection_string(connection_string)
-            container_client = blob_service_client.get_container_client(CONFIG['AZURE_CONTAINER_NAME'])
-            container_client.upload_blob(
+            await blob_container().upload_blob(
                 name=blob_name,
-                data=json_data.encode('utf-8'),
-                overwrite=True
+                data=orjson.dumps(data, option=orjson.OPT_INDENT_2),
+                overwrite=True,
+                content_settings=content_settings("application/json")
             )
-            blob_url = f"https://{CONFIG['AZURE_STORAGE_ACCOUNT_NAME']}.blob.core.windows.net/{CONFIG['AZURE_CONTAINER_NAME']}/{blob_name}"
+            blob_url = blob_url_for(blob_name)
             logger.info(f"JSON data uploaded to Azure Blob Storage: {blob_url}")
             return True
         except Exception as e:
             logger.error(f"Failed to upload JSON data to Azure Blob Storage: {e}")
             return False
         
-    async def run_automation(self, data: CaseData) -> Tuple[bool, str, Optional[str], Optional[str]]:
+    def _run_flow(self, data: CaseData, json_data: Dict[str, Any]) -> Optional[bytes]:
+        """Blocking browser flow: fill and submit the form, then capture the confirmation page"""
+        self.navigate_and_fill_form(data)
+        if CONFIG['BLOCK_IMAGES']:
+            # The confirmation page is the artifact sent to Salesforce; load it with its images
+            set_image_blocking(self.driver, False)
+        if not self.click_button(CONTINUE_BTN, "Continue after receive EIN"):
+            raise Exception("Failed to continue after receive EIN selection")
+        json_data["response_status"] = "success"
+        if CONFIG['SCREENSHOT_METHOD'] == "screenshot":
+            return self._capture_screenshot()
+        return self._initiate_pdf()
+
+    async def run_automation(self, data: CaseData, background_tasks: Optional[BackgroundTasks] = None) -> Tuple[bool, str, Optional[str], Optional[str], Optional[str]]:
         try:
-            missing_fields = []
-            for field_name in data.__dict__:
-                if getattr(data, field_name) is None and field_name != "record_id":
-                    missing_fields.append(field_name)
-            if missing_fields:
+            missing_fields = [name for name in _DATA_FIELDS if getattr(data, name) is None]
+            if missing_fields and logger.isEnabledFor(logging.INFO):
                 logger.info(f"Missing fields: {', '.join(missing_fields)} - using defaults where applicable")
-            json_data = {
-                "record_id": data.record_id,
-                "form_type": data.form_type,
-                "entity_name": data.entity_name,
-                "entity_type": data.entity_type,
-                "formation_date": data.formation_date,
-                "business_category": data.business_category,
-                "business_description": data.business_description,
-                "business_address_1": data.business_address_1,
-                "entity_state": data.entity_state,
-                "business_address_2": data.business_address_2,
-                "city": data.city,
-                "zip_code": data.zip_code,
-                "quarter_of_first_payroll": data.quarter_of_first_payroll,
-                "entity_state_record_state": data.entity_state_record_state,
-                "case_contact_name": data.case_contact_name,
-                "ssn_decrypted": data.ssn_decrypted,
-                "proceed_flag": data.proceed_flag,
-                "entity_members": data.entity_members,
-                "locations": data.locations,
-                "mailing_address": data.mailing_address,
-                "county": data.county,
-                "trade_name": data.trade_name,
-                "care_of_name": data.care_of_name,
-                "closing_month": data.closing_month,
-                "filing_requirement": data.filing_requirement,
-                "employee_details": data.employee_details.model_dump() if data.employee_details else None,
-                "third_party_designee": data.third_party_designee.model_dump() if data.third_party_designee else None,
-                "llc_details": data.llc_details.model_dump() if data.llc_details else None,
-                "response_status": None
-            }
-            self.initialize_driver()
-            self.navigate_and_fill_form(data)
-            if not self.click_button((By.XPATH, "//input[@type='submit' and @value='Continue >>']"), "Continue after receive EIN"):
-                raise Exception("Failed to continue after receive EIN selection")
-            json_data["response_status"] = "success"
+            json_data = data.model_dump()
+            json_data["response_status"] = None
+            await self.acquire_driver()
+            # Selenium is blocking; run the browser flow off the event loop
+            loop = asyncio.get_running_loop()
+            capture = await loop.run_in_executor(AUTOMATION_EXECUTOR, self._run_flow, data, json_data)
+            # Reset the browser for the next run while the results are stored
+            release = asyncio.create_task(self.release_driver())
             png_filename = f"print_{data.record_id}_{int(time.time())}.png"
-            png_path = self.capture_page_as_png(png_filename)
-            azure_blob_url = None
-            if png_path:
-                azure_blob_url = self.upload_screenshot_to_azure_sync(
-                    entity_process_id=data.record_id,
-                    legal_name=data.entity_name or "UnknownEntity",
-                    png_path=png_path
+            legal_name = data.entity_name or "UnknownEntity"
+            png_path, png_url, azure_blob_url = None, None, None
+            if capture and background_tasks is not None:
+                # Rendering and upload run after the response is sent
+                background_tasks.add_task(self._store_screenshot, capture, png_filename, data.record_id, legal_name)
+                png_path, png_url = self._png_location(png_filename)
+                azure_blob_url = blob_url_for(self._screenshot_blob_name(data.record_id, legal_name))
+                await self._save_json_data(json_data)
+            elif capture:
+                azure_blob_url, _ = await asyncio.gather(
+                    self._store_screenshot(capture, png_filename, data.record_id, legal_name),
+                    self._save_json_data(json_data)
                 )
-            self._save_json_data_sync(json_data)
-            return True, "Form submitted successfully", png_path, azure_blob_url
+                png_path, png_url = self._png_location(png_filename)
+                if not await asyncio.to_thread(os.path.exists, png_path):
+                    png_path, png_url = None, None
+            else:
+                await self._save_json_data(json_data)
+            await release
+            return True, "Form submitted successfully", png_path, png_url, azure_blob_url
         except Exception as e:
             logger.error(f"Automation failed: {e}")
             json_data["response_status"] = "fail"
-            self._save_json_data_sync(json_data)
-            return False, str(e), None, None
+            # A browser left mid-form is not worth resetting; the pool replaces it
+            await asyncio.gather(self.release_driver(discard=True), self._save_json_data(json_data))
+            return False, str(e), None, None, None
+        except BaseException:
+            # Cancelled (e.g. at shutdown) while the executor thread may still drive the browser;
+            # never hand it back to the pool
+            await self.release_driver(discard=True)
+            raise
         finally:
-            self.cleanup()
+            await self.release_driver()
     
     def _get_defaults(self, data: CaseData) -> Dict[str, Any]:
         entity_members_dict = data.entity_members or {}
-        mailing_address_dict = data.mailing_address or {}
-        third_party_designee = data.third_party_designee or ThirdPartyDesignee()
-        employee_details = data.employee_details or EmployeeDetails()
-        llc_details = data.llc_details or LLcDetails()
-        return {
+        defaults = {key: str(getattr(data, key) or default) for key, default in _DEFAULTS.items()}
+        defaults.update({
             'first_name': entity_members_dict.get("first_name_1", "") or "Rob",
             'last_name': entity_members_dict.get("last_name_1", "") or "Chuchla",
             'phone': entity_members_dict.get('phone_1', '') or '2812173123',
-            'ssn_decrypted': str(data.ssn_decrypted or "123456789"),
-            'entity_name': str(data.entity_name or "Lane Four Capital Partners LLC"),
-            'business_address_1': str(data.business_address_1 or "3315 Cherry Ln"),
-            'city': str(data.city or "Austin"),
-            'zip_code': str(data.zip_code or "78703"),
-            'business_description': str(data.business_description or "Any and lawful business"),
-            'formation_date': str(data.formation_date or "2024-05-24"),
-            'county': str(data.county or "Travis"),
-            'trade_name': str(data.trade_name or ""),
-            'care_of_name': str(data.care_of_name or ""),
-            'mailing_address': mailing_address_dict,
-            'closing_month': str(data.closing_month or ""),
-            'filing_requirement': str(data.filing_requirement or ""),
-            'employee_details': employee_details.model_dump() if hasattr(employee_details, 'model_dump') else {},
-            'third_party_details': third_party_designee.model_dump() if third_party_designee and hasattr(third_party_designee, 'model_dump') else {},
-            'llc_details': llc_details.model_dump() if llc_details and hasattr(llc_details, 'model_dump') else {}
-        }
+            'mailing_address': data.mailing_address or {},
+            'employee_details': (data.employee_details or EmployeeDetails()).model_dump(),
+            'third_party_details': (data.third_party_designee or ThirdPartyDesignee()).model_dump(),
+            'llc_details': (data.llc_details or LLcDetails()).model_dump()
+        })
+        return defaults
 
 # DataProcessor (unchanged, included for context)
 class DataProcessor:
     @staticmethod
-    def map_form_automation_data(form_data: Dict[str, Any]) -> CaseData:
-        responsible_party = form_data.get("responsibleParty", {})
-        ownership_details = form_data.get("ownershipDetails", [])
-        mailing_address = form_data.get("mailingAddress", {})
-        physical_address = form_data.get("physicalAddress", {})
-        employee_details = form_data.get("employeeDetails", {})
-        third_party = form_data.get("thirdPartyDesignee", {})
-        llc_details = form_data.get("llcDetails", {})
-        entity_type = form_data.get("entityType")
+    def map_form_automation_data(form_data: EinRequest) -> CaseData:
+        responsible_party = form_data.responsibleParty
+        ownership_details = form_data.ownershipDetails
+        mailing_address = form_data.mailingAddress
+        physical_address = form_data.physicalAddress
+        employee_details = form_data.employeeDetails
+        third_party = form_data.thirdPartyDesignee
+        llc_details = form_data.llcDetails
+        entity_type = form_data.entityType
         if not entity_type:
             logger.warning("No entityType provided in payload, using default: Limited Liability Company (LLC)")
             entity_type = "Limited Liability Company (LLC)"
@@ -1028,22 +1226,24 @@ class DataProcessor:
         entity_members_dict = {}
         responsible_first_name = responsible_party.get("firstName", "").strip()
         responsible_last_name = responsible_party.get("lastName", "").strip()
+        responsible_first_lc = responsible_first_name.lower()
+        responsible_last_lc = responsible_last_name.lower()
         for index, member in enumerate(ownership_details, 1):
             member_first_name = member.get("firstName", "").strip()
             member_last_name = member.get("lastName", "").strip()
-            if (member_first_name.lower() == responsible_first_name.lower() and 
-                member_last_name.lower() == responsible_last_name.lower()):
+            if (member_first_name.lower() == responsible_first_lc and
+                member_last_name.lower() == responsible_last_lc):
                 entity_members_dict["first_name_1"] = member.get("firstName")
                 entity_members_dict["last_name_1"] = member.get("lastName")
                 entity_members_dict["phone_1"] = responsible_party.get("phone")
-                entity_members_dict["name_1"] = f"{member.get('firstName', '')} {member.get('lastName', '')}".strip()
+                entity_members_dict["name_1"] = " ".join(filter(None, (member_first_name, member_last_name)))
                 entity_members_dict["percent_ownership_1"] = str(member.get("ownershipPercentage")) if member.get("ownershipPercentage") is not None else None
                 break
         if not entity_members_dict:
             entity_members_dict["first_name_1"] = responsible_first_name
             entity_members_dict["last_name_1"] = responsible_last_name
             entity_members_dict["phone_1"] = responsible_party.get("phone")
-            entity_members_dict["name_1"] = f"{responsible_first_name} {responsible_last_name}".strip()
+            entity_members_dict["name_1"] = " ".join(filter(None, (responsible_first_name, responsible_last_name)))
             entity_members_dict["percent_ownership_ownership_1"] = None
         locations = [{
             "physicalStreet": physical_address.get("physicalStreet"),
@@ -1052,18 +1252,18 @@ class DataProcessor:
             "physicalZip": physical_address.get("physicalZip")
         }]
         return CaseData(
-            record_id=form_data.get("entityProcessId", "temp_record_id"),
-            form_type=form_data.get("formType"),
-            entity_name=form_data.get("legalName"),
+            record_id=form_data.entityProcessId,
+            form_type=form_data.formType,
+            entity_name=form_data.legalName,
             entity_type=entity_type,
-            formation_date=form_data.get("startDate"),
-            business_category=form_data.get("principalLineOfBusiness"),
-            business_description=form_data.get("principalActivity"),
+            formation_date=form_data.startDate,
+            business_category=form_data.principalLineOfBusiness,
+            business_description=form_data.principalActivity,
             business_address_1=physical_address.get("physicalStreet"),
             entity_state=physical_address.get("physicalState"),
             city=physical_address.get("physicalCity"),
             zip_code=physical_address.get("Zip"),
-            quarter_of_first_payroll=form_data.get("firstWagesDate"),
+            quarter_of_first_payroll=form_data.firstWagesDate,
             entity_state_record_state=physical_address.get("physicalState"),
             case_contact_name=None,
             ssn_decrypted=responsible_party.get("ssnOrItinOrEin"),
@@ -1076,11 +1276,11 @@ class DataProcessor:
                 "mailingState": mailing_address.get("mailingState"),
                 "mailingZip": mailing_address.get("mailingZip")
             },
-            county=form_data.get("county"),
-            trade_name=form_data.get("tradeName"),
-            care_of_name=form_data.get("careOfName"),
-            closing_month=form_data.get("closingMonth"),
-            filing_requirement=form_data.get("filingRequirement"),
+            county=form_data.county,
+            trade_name=form_data.tradeName,
+            care_of_name=form_data.careOfName,
+            closing_month=form_data.closingMonth,
+            filing_requirement=form_data.filingRequirement,
             employee_details=EmployeeDetails(other=employee_details.get("other")),
             third_party_designee=ThirdPartyDesignee(
                 name=third_party.get("name"),
@@ -1091,8 +1291,16 @@ class DataProcessor:
             llc_details=LLcDetails(number_of_members=str(llc_details.get("numberOfMembers"))) if llc_details.get("numberOfMembers") is not None else None
         )
 
+DRIVER_POOL = DriverPool(functools.partial(IRSEINAutomation.create_driver, CONFIG['HEADLESS']), CONFIG['DRIVER_POOL_SIZE'])
+# One thread per pooled browser runs the blocking Selenium flows
+AUTOMATION_EXECUTOR = ThreadPoolExecutor(max_workers=CONFIG['DRIVER_POOL_SIZE'], thread_name_prefix="irs-ein")
+
 # FastAPI Application
-app = FastAPI(title="IRS EIN API", description="Automated IRS EIN form processing", version="2.0.2")
+# Expected Authorization header, built once for a constant-time comparison per request
+EXPECTED_AUTH = f"Bearer {CONFIG['API_KEY']}".encode()
+
+app = FastAPI(title="IRS EIN API", description="Automated IRS EIN form processing", version="2.0.2",
+              default_response_class=ORJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -1102,54 +1310,82 @@ app.add_middleware(
 )
 app.mount("/static", StaticFiles(directory=CONFIG['STATIC_DIR']), name="static")
 
-@app.post("/run-irs-ein")
-async def run_irs_ein_endpoint(request: Request, authorization: str = Header(None)):
-    """Main endpoint for running IRS EIN automation with direct submission"""
-    logger.info(f"Received request from: {request.client.host if request.client else 'Unknown'}")
-    if authorization != f"Bearer {CONFIG['API_KEY']}":
+@app.on_event("startup")
+async def warm_driver_pool():
+    try:
+        await DRIVER_POOL.warm()
+    except Exception as e:
+        logger.error(f"Failed to warm driver pool, browsers will be launched on demand: {e}")
+
+@app.on_event("shutdown")
+async def release_resources():
+    AUTOMATION_EXECUTOR.shutdown(wait=False)
+    DRIVER_POOL.close()
+    if blob_service.cache_info().currsize:
+        await blob_service().close()
+
+async def require_api_key(authorization: str = Header(None)):
+    """Reject requests without the expected Bearer API key before the body is read"""
+    if authorization is None or not hmac.compare_digest(authorization.encode(), EXPECTED_AUTH):
         raise HTTPException(status_code=401, detail="Invalid API key")
+
+@app.post("/run-irs-ein", dependencies=[Depends(require_api_key)], response_model=None)
+async def run_irs_ein_endpoint(request: Request, background_tasks: BackgroundTasks):
+    """Main endpoint for running IRS EIN automation with direct submission"""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Received request from: %s", request.client.host if request.client else "Unknown")
+    body = await request.body()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received payload: %s", body.decode(errors="replace"))
+    try:
+        # Parses and validates in one pass inside pydantic-core
+        ein_request = EinRequest.model_validate_json(body)
+    except ValidationError as e:
+        # Only loc/msg: the raw input would echo the payload (and SSN) back to the caller
+        problems = [f"{'.'.join(map(str, err['loc'])) or 'body'}: {err['msg']}" for err in e.errors()]
+        raise HTTPException(status_code=400, detail=f"Invalid payload: {problems}")
     try:
-        data = await request.json()
-        logger.info(f"Received payload: {json.dumps(data, indent=2)}")
-        if not isinstance(data, dict):
-            raise HTTPException(status_code=400, detail="Invalid payload format - expected JSON object")
-        required_fields = ["entityProcessId", "formType"]
-        missing_fields = [field for field in required_fields if field not in data]
-        if missing_fields:
-            raise HTTPException(status_code=400, detail=f"Missing required fields: {missing_fields}")
-        if data.get("formType") != "EIN":
-            raise HTTPException(status_code=400, detail="Invalid formType, must be 'EIN'")
-        case_data = DataProcessor.map_form_automation_data(data)
-        logger.info(f"Mapped case data for record_id: {case_data.record_id}")
+        case_data = DataProcessor.map_form_automation_data(ein_request)
+        logger.info("Mapped case data for record_id: %s", case_data.record_id)
         automation = IRSEINAutomation()
-        success, message, png_path, png_url, azure_blob_url = await automation.run_automation(case_data)
-        if success:
-            return {
-                "message": "Form submitted successfully",
-                "status": "Submitted",
-                "record_id": case_data.record_id,
-                "png_url": png_url,
-                "azure_blob_url": azure_blob_url
-            }
-        else:
-            raise HTTPException(status_code=500, detail=message)
-    except HTTPException:
-        raise
+        success, message, png_path, png_url, azure_blob_url = await automation.run_automation(case_data, background_tasks)
     except Exception as e:
-        logger.error(f"Endpoint error: {str(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception("Endpoint error: %s", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    if not success:
+        raise HTTPException(status_code=500, detail=message)
+    # Returning the response object directly skips jsonable_encoder for this flat, all-string body
+    return ORJSONResponse({
+        "message": "Form submitted successfully",
+        "status": "Submitted",
+        "record_id": case_data.record_id,
+        "png_url": png_url,
+        "azure_blob_url": azure_blob_url
+    })
+
+class ScreenshotResponse(FileResponse):
+    """FileResponse that reads screenshots in 1 MiB chunks; most PNGs go out in one or two reads"""
+    chunk_size = 1024 * 1024
 
 @app.get("/download-screenshot/{record_id}")
 async def download_screenshot(record_id: str):
     """Download screenshot for a record"""
-    png_files = [f for f in os.listdir(CONFIG['STATIC_DIR']) 
-                if f.startswith(f"print_{record_id}_") and f.endswith(".png")]
-    if not png_files:
+    if not RECORD_ID_RE.fullmatch(record_id):
         raise HTTPException(status_code=404, detail="Screenshot not found")
-    latest_png = os.path.join(CONFIG['STATIC_DIR'], sorted(png_files)[-1])
-    return FileResponse(latest_png, media_type="image/png")
+    latest_png = LATEST_SCREENSHOTS.get(record_id)
+    if latest_png and not await asyncio.to_thread(os.path.exists, latest_png):
+        # Removed from disk since it was indexed; rescan rather than fail in FileResponse
+        LATEST_SCREENSHOTS.pop(record_id, None)
+        latest_png = None
+    if not latest_png:
+        latest_png = await asyncio.to_thread(find_latest_screenshot, record_id)
+        if not latest_png:
+            raise HTTPException(status_code=404, detail="Screenshot not found")
+        remember_screenshot(record_id, latest_png)
+    return ScreenshotResponse(latest_png, media_type="image/png")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=CONFIG['PORT'])
\ No newline at end of file
+    # Workers are separate processes, so the app is passed as an import string
+    uvicorn.run("final_AKS:app", host="0.0.0.0", port=CONFIG['PORT'], workers=CONFIG['WORKERS'],
+                loop="uvloop", http="httptools", log_level="warning", access_log=False)
\ No newline at end of file